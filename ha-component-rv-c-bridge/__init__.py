@@ -12,15 +12,52 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
 from typing import Any
 
-from homeassistant.const import CONF_ENABLED, Platform
-from homeassistant.core import HomeAssistant, callback
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_FAN_MODE, ATTR_HVAC_MODE
+from homeassistant.const import ATTR_TEMPERATURE, CONF_ENABLED, Platform
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN, ATTR_ENTITY_ID, ATTR_SENSOR_TYPE
+from .climate import HA_FAN_TO_RVC, HA_MODE_TO_RVC, async_apply_bulk_command
+from .const import (
+    ATTR_ENTITY_ID,
+    ATTR_RESOLUTION,
+    ATTR_SENSOR_TYPE,
+    ATTR_ZONES,
+    CONF_ACK_TIMEOUT,
+    CONF_DISCOVER_UNKNOWN,
+    CONF_FLUSH_INTERVAL,
+    CONF_STALE_TIMEOUT,
+    CONF_ZONE_MAP,
+    CONF_ZONE_PROFILE,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_STALE_TIMEOUT,
+    DOMAIN,
+    SERVICE_GET_HISTORY,
+    SERVICE_LOG_UNKNOWN_PGNS,
+    SERVICE_RELOAD_ZONES,
+    SERVICE_SET_ZONES,
+)
+from .ingress import RVCIngress
+from .registry import RVCRegistry
+from .scheduler import StateWriteScheduler
+from .snapshot import RVCSnapshot
+from .staleness import StalenessTracker
+from .unknown import UnknownAggregator
+from .zone_mappings import ZoneMap, compile_zone_map, load_zone_profile
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,30 +69,204 @@ CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the RV-C Bridge integration."""
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_log_unknown_pgns(call: ServiceCall) -> ServiceResponse:
+        """Log and return a snapshot of unmapped categories per entry."""
+        snapshots = {}
+        for entry_id, entry_data in hass.data[DOMAIN].items():
+            unknown = entry_data["unknown"]
+            snapshot = unknown.snapshot()
+            snapshots[entry_id] = snapshot
+            _LOGGER.info(
+                "Unknown rvcbridge categories (%s): %s",
+                entry_id,
+                json.dumps(snapshot["unknown"]),
+            )
+            if call.data.get("clear"):
+                unknown.clear()
+        return {"entries": snapshots}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_LOG_UNKNOWN_PGNS,
+        async_log_unknown_pgns,
+        schema=vol.Schema({vol.Optional("clear", default=False): cv.boolean}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return downsampled min/max/mean history for RV-C sensors."""
+        wanted = set(call.data[ATTR_ENTITY_ID])
+        resolution = call.data[ATTR_RESOLUTION]
+        history = {}
+        for entry_data in hass.data[DOMAIN].values():
+            for record in entry_data["registry"]:
+                entity = record.entity
+                if entity.entity_id in wanted and getattr(entity, "history", None):
+                    history[entity.entity_id] = getattr(
+                        entity.history, resolution
+                    ).buckets()
+        return {"history": history}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=vol.Schema(
+            {
+                vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+                vol.Optional(ATTR_RESOLUTION, default="minute"): vol.In(
+                    ["minute", "hour"]
+                ),
+            }
+        ),
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_set_zones(call: ServiceCall) -> ServiceResponse:
+        """Apply setpoint/mode/fan to many zones as one bulk command.
+
+        Only waits for the zones' acks when the caller wants the response.
+        """
+        responses = {}
+        for entry_id, entry_data in hass.data[DOMAIN].items():
+            entry = hass.config_entries.async_get_entry(entry_id)
+            responses[entry_id] = await async_apply_bulk_command(
+                hass,
+                entry_data,
+                call.data.get(ATTR_ZONES),
+                temperature=call.data.get(ATTR_TEMPERATURE),
+                hvac_mode=call.data.get(ATTR_HVAC_MODE),
+                fan_mode=call.data.get(ATTR_FAN_MODE),
+                ack_timeout=entry.options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT),
+                wait_for_acks=call.return_response,
+            )
+        return {"entries": responses} if call.return_response else None
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_ZONES,
+        async_set_zones,
+        schema=vol.All(
+            vol.Schema(
+                {
+                    vol.Optional(ATTR_ZONES): vol.All(
+                        cv.ensure_list, [vol.Any(cv.positive_int, cv.string)]
+                    ),
+                    vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+                    vol.Optional(ATTR_HVAC_MODE): vol.In(
+                        [str(mode) for mode in HA_MODE_TO_RVC]
+                    ),
+                    vol.Optional(ATTR_FAN_MODE): vol.In(list(HA_FAN_TO_RVC)),
+                }
+            ),
+            cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE, ATTR_FAN_MODE),
+        ),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def async_reload_zones(call: ServiceCall) -> None:
+        """Re-read zone profiles by reloading every entry (entities renamed)."""
+        for entry_id in list(hass.data[DOMAIN]):
+            await hass.config_entries.async_reload(entry_id)
+
+    hass.services.async_register(DOMAIN, SERVICE_RELOAD_ZONES, async_reload_zones)
     return True
 
 
+async def _async_load_zone_map(hass: HomeAssistant, entry) -> ZoneMap:
+    """Compile the entry's zone map: built-in < YAML profile < zone_map option."""
+    profile = None
+    if path := entry.options.get(CONF_ZONE_PROFILE):
+        try:
+            profile = await hass.async_add_executor_job(
+                load_zone_profile, hass.config.path(path)
+            )
+            compile_zone_map(profile)  # Unknown contexts or instance keys
+        except (OSError, AttributeError, TypeError, ValueError) as err:
+            _LOGGER.error("Ignoring zone profile %s: %s", path, err)
+            profile = None
+    try:
+        return compile_zone_map(profile, entry.options.get(CONF_ZONE_MAP))
+    except (AttributeError, TypeError, ValueError) as err:
+        _LOGGER.error("Ignoring invalid zone_map option: %s", err)
+        return compile_zone_map(profile)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry) -> bool:
     """Set up RV-C Bridge from a config entry (MQTT-native)."""
     _LOGGER.info("Setting up RV-C Bridge integration (MQTT mode)")
+    setup_started = time.monotonic()
+
+    scheduler = StateWriteScheduler(
+        hass, entry.options.get(CONF_FLUSH_INTERVAL, DEFAULT_FLUSH_INTERVAL)
+    )
+    entry.async_on_unload(scheduler.async_shutdown)
+
+    registry = RVCRegistry()
+    staleness = None
+    if stale_timeout := entry.options.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT):
+        staleness = StalenessTracker(hass, registry, scheduler, stale_timeout)
+        entry.async_on_unload(staleness.async_stop)
+    ingress = RVCIngress(hass, staleness)
+    entry.async_on_unload(ingress.async_stop)
+    snapshot = RVCSnapshot(hass, entry.entry_id, registry)
+    await snapshot.async_load()
+    entry.async_on_unload(snapshot.async_flush)
+    zones = await _async_load_zone_map(hass, entry)
 
-    hass.data[DOMAIN][entry.entry_id] = {
-        "sensor_registry": {},  # Track sensors we've created
-        "pgn_log": [],  # Log unknown PGNs for discovery
+    hass.data[DOMAIN][entry.entry_id] = entry_data = {
+        "registry": registry,  # Entities we've created + hot-path state
+        "snapshot": snapshot,  # Last-known state for startup hydration
+        "unknown": UnknownAggregator(),  # Unmapped categories for discovery
+        "write_stats": {"written": 0, "suppressed": 0},  # Deadband counters
+        "write_scheduler": scheduler,  # Coalesces state writes
+        "setup_started": setup_started,  # For discovery timing logs
+        "ingress": ingress,  # Shared MQTT subscription + decode
+        "staleness": staleness,  # Marks silent sources unavailable (or None)
+        "zones": zones,  # Compiled instance -> zone name tables
     }
 
-    # Forward setup to sensor platform
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+
+    # Forward setup to platforms; they register their categories with ingress
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await ingress.async_start(
+        entry_data["unknown"] if entry.options.get(CONF_DISCOVER_UNKNOWN) else None
+    )
+    if staleness is not None:
+        staleness.async_start()
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry) -> None:
+    """Reload when options (deadbands, heartbeat) change."""
+    await async_reload_entry(hass, entry)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry) -> bool:
-    """Unload RV-C Bridge integration."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    """Unload RV-C Bridge integration.
+
+    Subscriptions, timers and tasks are registered with entry.async_on_unload
+    (or created as entry tasks), which HA runs once this returns True.
+    """
+    if unload_ok := await hass.config_entries.async_unload_platforms(
+        entry, PLATFORMS
+    ):
+        hass.data[DOMAIN].pop(entry.entry_id)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry) -> None:
+    """Delete the entry's state snapshot."""
+    await RVCSnapshot(hass, entry.entry_id, RVCRegistry()).async_remove()
 
 
 async def async_reload_entry(hass: HomeAssistant, entry) -> bool:
-    """Reload RV-C Bridge integration."""
-    await async_unload_entry(hass, entry)
-    return await async_setup_entry(hass, entry)
+    """Reload RV-C Bridge integration.
+
+    Goes through the config entry manager so async_on_unload callbacks run;
+    calling unload/setup directly would leave the old subscriptions behind.
+    """
+    return await hass.config_entries.async_reload(entry.entry_id)
@@ -9,8 +9,10 @@ the RV's HVAC system.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from typing import Any, Optional
 
 from homeassistant.components import mqtt
@@ -28,8 +30,18 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
-from .zone_mappings import get_zone_name
+from .const import (
+    COMMAND_RETRIES,
+    CONF_ACK_TIMEOUT,
+    CONF_COMMAND_WINDOW,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_COMMAND_WINDOW,
+    DOMAIN,
+    MQTT_TOPIC_THERMOSTAT_BULK,
+    SETPOINT_ACK_TOLERANCE,
+)
+from .discovery import EntityBatcher
+from .stats import COMMAND_LATENCY_BUCKETS_US, Histogram
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,6 +65,19 @@ RVC_FAN_TO_HA = {
 
 HA_FAN_TO_RVC = {v: k for k, v in RVC_FAN_TO_HA.items()}
 
+MIN_TEMP_F = 50
+MAX_TEMP_F = 95
+
+
+def _report_matches(field: str, commanded: Any, reported: Any) -> bool:
+    """Return True if a reported value confirms a commanded one."""
+    if field == "setpoint_f":
+        try:
+            return abs(reported - commanded) <= SETPOINT_ACK_TOLERANCE
+        except TypeError:
+            return False
+    return reported == commanded
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -62,98 +87,161 @@ async def async_setup_entry(
     """Set up RV-C Bridge climate entities from MQTT."""
     _LOGGER.info("Setting up RV-C Bridge climate platform")
 
-    registry = hass.data[DOMAIN][entry.entry_id]
-    climate_registry = registry.setdefault("climate_registry", {})
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    registry = entry_data["registry"]
+    scheduler = entry_data["write_scheduler"]
+    zones = entry_data["zones"]
+    batcher = EntityBatcher(
+        hass, async_add_entities, "climate", entry_data["setup_started"]
+    )
+    entry.async_on_unload(batcher.async_shutdown)
 
     @callback
-    def async_handle_thermostat_status(msg: mqtt.ReceiveMessage) -> None:
-        """Handle thermostat_status MQTT updates."""
-        topic = msg.topic
-        payload = msg.payload
-
-        # Parse: rvcbridge/thermostat_status/{instance}
-        parts = topic.split("/")
-        if len(parts) != 3 or parts[1] != "thermostat_status":
-            return
-
-        instance = parts[2]
-        try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
-            _LOGGER.warning(f"Failed to decode JSON from {topic}: {payload}")
-            return
-
-        entity_id = f"climate_thermostat_{instance}"
-
-        # Create climate entity if not exists
-        if entity_id not in climate_registry:
-            zone_name = get_zone_name(int(instance), context="thermostat")
+    def _async_get_thermostat(instance: str) -> RVCThermostat:
+        """Return the thermostat for an instance, queueing it if new."""
+        record = registry.get(("thermostat", instance, "climate"))
+        if record is None:
+            zone_name = zones.name(instance, "thermostat")
             climate = RVCThermostat(
-                entry_id=entry.entry_id,
+                entry=entry,
                 instance=instance,
                 zone_name=zone_name,
                 hass=hass,
+                command_window=entry.options.get(
+                    CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW
+                ),
+                ack_timeout=entry.options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT),
             )
-            climate_registry[entity_id] = climate
-            async_add_entities([climate], update_before_add=False)
-            _LOGGER.info(f"Created climate entity: {entity_id} ({zone_name})")
+            record = registry.add(("thermostat", instance, "climate"), climate)
+            batcher.async_add(climate)
+            _LOGGER.debug("Discovered climate thermostat %s (%s)", instance, zone_name)
+        return record.entity
+
+    snapshot = entry_data["snapshot"]
 
+    @callback
+    def async_handle_thermostat_status(
+        category: str, instance: str, data: dict[str, Any]
+    ) -> None:
+        """Handle decoded thermostat_status updates."""
         # Update the climate entity
-        climate = climate_registry[entity_id]
+        climate = _async_get_thermostat(instance)
+        report = {}
         if "mode" in data:
-            climate._attr_hvac_mode = RVC_MODE_TO_HA.get(data["mode"], HVACMode.OFF)
+            report["mode"] = data["mode"]
         if "fan_mode" in data:
-            climate._attr_fan_mode = RVC_FAN_TO_HA.get(data["fan_mode"], FAN_AUTO)
-        climate.async_write_ha_state()
+            report["fan_mode"] = data["fan_mode"]
+        climate.async_apply_report(report)
+        scheduler.async_schedule(climate)
+        snapshot.async_mark_dirty()
 
     @callback
-    def async_handle_thermostat_setpoint(msg: mqtt.ReceiveMessage) -> None:
-        """Handle thermostat_setpoint MQTT updates."""
-        topic = msg.topic
-        payload = msg.payload
-
-        # Parse: rvcbridge/thermostat_setpoint/{instance}
-        parts = topic.split("/")
-        if len(parts) != 3 or parts[1] != "thermostat_setpoint":
-            return
-
-        instance = parts[2]
-        try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
-            _LOGGER.warning(f"Failed to decode JSON from {topic}: {payload}")
-            return
-
-        entity_id = f"climate_thermostat_{instance}"
-
-        # Create climate entity if not exists
-        if entity_id not in climate_registry:
-            zone_name = get_zone_name(int(instance), context="thermostat")
-            climate = RVCThermostat(
-                entry_id=entry.entry_id,
-                instance=instance,
-                zone_name=zone_name,
-                hass=hass,
-            )
-            climate_registry[entity_id] = climate
-            async_add_entities([climate], update_before_add=False)
-            _LOGGER.info(f"Created climate entity: {entity_id} ({zone_name})")
-
+    def async_handle_thermostat_setpoint(
+        category: str, instance: str, data: dict[str, Any]
+    ) -> None:
+        """Handle decoded thermostat_setpoint updates."""
         # Update setpoint
-        climate = climate_registry[entity_id]
+        climate = _async_get_thermostat(instance)
         if "temp_f" in data:
             climate._attr_current_temperature = data["temp_f"]
-            climate._attr_target_temperature = data["temp_f"]
-        climate.async_write_ha_state()
+            climate.async_apply_report({"setpoint_f": data["temp_f"]})
+        scheduler.async_schedule(climate)
+        snapshot.async_mark_dirty()
 
-    # Subscribe to both thermostat topics
-    await mqtt.async_subscribe(
-        hass, "rvcbridge/thermostat_status/+", async_handle_thermostat_status, 0
-    )
-    await mqtt.async_subscribe(
-        hass, "rvcbridge/thermostat_setpoint/+", async_handle_thermostat_setpoint, 0
-    )
-    _LOGGER.info("Subscribed to thermostat MQTT topics")
+    # Hydrate thermostats from the last snapshot instead of 72°F defaults
+    for instance, hvac_mode, fan_mode, target, current in snapshot.restored.get(
+        "thermostats", []
+    ):
+        climate = _async_get_thermostat(instance)
+        if hvac_mode in HA_MODE_TO_RVC:
+            climate._attr_hvac_mode = HVACMode(hvac_mode)
+        if fan_mode in HA_FAN_TO_RVC:
+            climate._attr_fan_mode = fan_mode
+        if target is not None:
+            climate._attr_target_temperature = target
+        if current is not None:
+            climate._attr_current_temperature = current
+
+    # Consume both thermostat categories from the shared ingress
+    ingress = entry_data["ingress"]
+    ingress.async_register("thermostat_status", async_handle_thermostat_status)
+    ingress.async_register("thermostat_setpoint", async_handle_thermostat_setpoint)
+
+
+async def async_apply_bulk_command(
+    hass: HomeAssistant,
+    entry_data: dict[str, Any],
+    zones: Optional[list[int | str]],
+    temperature: Optional[float] = None,
+    hvac_mode: Optional[str] = None,
+    fan_mode: Optional[str] = None,
+    ack_timeout: float = DEFAULT_ACK_TIMEOUT,
+    wait_for_acks: bool = True,
+) -> dict[str, dict[str, Any]]:
+    """Send one command for many zones on the bulk topic; report per zone.
+
+    zones are thermostat instances or zone names (None = every mapped
+    thermostat zone). Waits for each discovered zone to confirm (or revert)
+    and returns {instance: {"zone", "status", "latency_ms"}}. Without
+    wait_for_acks it returns right after publishing, with discovered zones
+    reported as "sent"; the entities still track the acks and revert.
+    """
+    zone_map = entry_data["zones"]
+    instances = []
+    for zone in zones or zone_map.instances("thermostat"):
+        instance = zone_map.instance(str(zone), "thermostat")
+        if instance is not None:
+            instances.append(instance)
+        else:
+            _LOGGER.warning("Unknown thermostat zone: %s", zone)
+
+    command: dict[str, Any] = {}
+    if temperature is not None:
+        command["setpoint_f"] = max(MIN_TEMP_F, min(MAX_TEMP_F, temperature))
+    if hvac_mode is not None:
+        command["mode"] = HA_MODE_TO_RVC[HVACMode(hvac_mode)]
+    if fan_mode is not None:
+        command["fan_mode"] = HA_FAN_TO_RVC[fan_mode]
+
+    registry = entry_data["registry"]
+    results: dict[str, dict[str, Any]] = {}
+    waiters: dict[str, asyncio.Future] = {}
+    for instance in instances:
+        results[instance] = {
+            "zone": zone_map.name(instance, "thermostat"),
+            "status": "not_discovered",
+            "latency_ms": None,
+        }
+        record = registry.get(("thermostat", instance, "climate"))
+        if record is not None:
+            waiters[instance] = record.entity.async_begin_bulk_command(command)
+
+    payload = json.dumps({"zones": {instance: command for instance in instances}})
+    try:
+        await mqtt.async_publish(
+            hass, MQTT_TOPIC_THERMOSTAT_BULK, payload, qos=1, retain=False
+        )
+    except Exception as e:
+        _LOGGER.error(f"Failed to publish bulk command: {e}")
+
+    if not wait_for_acks:
+        for instance in waiters:
+            results[instance]["status"] = "sent"
+        return results
+
+    if waiters:
+        # Entities resolve on ack, or after re-send + revert
+        await asyncio.wait(
+            waiters.values(), timeout=ack_timeout * (COMMAND_RETRIES + 1) + 1
+        )
+    for instance, future in waiters.items():
+        latency_ms = future.result() if future.done() else None
+        results[instance]["status"] = (
+            "confirmed" if latency_ms is not None else "unconfirmed"
+        )
+        results[instance]["latency_ms"] = latency_ms
+
+    return results
 
 
 class RVCThermostat(ClimateEntity):
@@ -161,16 +249,21 @@ class RVCThermostat(ClimateEntity):
 
     def __init__(
         self,
-        entry_id: str,
+        entry: ConfigEntry,
         instance: str,
         zone_name: str,
         hass: HomeAssistant,
+        command_window: float = DEFAULT_COMMAND_WINDOW,
+        ack_timeout: float = DEFAULT_ACK_TIMEOUT,
     ):
         """Initialize the thermostat."""
-        self.entry_id = entry_id
+        # Publishes run as entry tasks so unload waits for them
+        self._entry = entry
+        self.entry_id = entry_id = entry.entry_id
         self.instance = instance
         self.zone_name = zone_name
         self.hass = hass
+        self.record = None  # Bound by RVCRegistry.add()
 
         self._attr_unique_id = f"{entry_id}_thermostat_{instance}"
         self._attr_name = f"RV {zone_name.title()} Thermostat"
@@ -178,8 +271,8 @@ class RVCThermostat(ClimateEntity):
         self._attr_fan_modes = list(HA_FAN_TO_RVC.keys())
         self._attr_temperature_unit = UnitOfTemperature.FAHRENHEIT
         self._attr_target_temperature_step = PRECISION_WHOLE
-        self._attr_min_temp = 50
-        self._attr_max_temp = 95
+        self._attr_min_temp = MIN_TEMP_F
+        self._attr_max_temp = MAX_TEMP_F
 
         # Default state
         self._attr_hvac_mode = HVACMode.OFF
@@ -187,6 +280,31 @@ class RVCThermostat(ClimateEntity):
         self._attr_current_temperature = 72.0
         self._attr_target_temperature = 72.0
 
+        # Commands issued within command_window are merged into one publish
+        self._command_window = command_window
+        self._pending_command: dict[str, Any] = {}
+        self._command_handle: Optional[asyncio.TimerHandle] = None
+
+        # Published commands awaiting a status echo (command field -> value)
+        self._ack_timeout = ack_timeout
+        self._awaiting: dict[str, Any] = {}
+        self._reported: dict[str, Any] = {}  # Last values the coach reported
+        self._sent_at: Optional[float] = None
+        self._retries = 0
+        self._ack_handle: Optional[asyncio.TimerHandle] = None
+        self.command_latency = Histogram(COMMAND_LATENCY_BUCKETS_US)
+        self._last_latency_ms: Optional[float] = None
+        self.command_timeouts = 0
+        self._ack_waiters: list[asyncio.Future] = []
+
+        # Set by StalenessTracker when the thermostat stops reporting
+        self.stale = False
+
+    @property
+    def available(self) -> bool:
+        """Thermostat is available while it keeps reporting status."""
+        return not self.stale
+
     @property
     def should_poll(self) -> bool:
         """No polling; updated via MQTT."""
@@ -201,6 +319,54 @@ class RVCThermostat(ClimateEntity):
             | ClimateEntityFeature.FAN_MODE
         )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Command round-trip (command -> status echo) metrics."""
+        return {
+            "command_pending": bool(self._awaiting or self._pending_command),
+            "command_latency_ms": self._last_latency_ms,
+            "command_latency_mean_ms": round(self.command_latency.mean_us / 1000, 1),
+            "command_timeouts": self.command_timeouts,
+        }
+
+    @callback
+    def async_apply_report(self, report: dict[str, Any]) -> None:
+        """Apply values reported by the coach, keyed by command field.
+
+        Fields with a command in flight keep their optimistic value until the
+        echo matches (ack) or the ack timeout reverts them.
+        """
+        awaiting = self._awaiting
+        for field, value in report.items():
+            self._reported[field] = value
+            if field in self._pending_command:
+                continue
+            if field in awaiting:
+                if not _report_matches(field, awaiting[field], value):
+                    continue
+                del awaiting[field]
+            self._apply_field(field, value)
+
+        if self._sent_at is not None and not awaiting:
+            # Every field of the last command has been confirmed
+            latency_ns = int((time.monotonic() - self._sent_at) * 1e9)
+            self.command_latency.observe(latency_ns)
+            self._last_latency_ms = round(latency_ns / 1e6, 1)
+            self._sent_at = None
+            if self._ack_handle is not None:
+                self._ack_handle.cancel()
+                self._ack_handle = None
+            self._async_resolve_waiters(self._last_latency_ms)
+
+    def _apply_field(self, field: str, value: Any) -> None:
+        """Set the HA attribute for a command field from an RV-C value."""
+        if field == "mode":
+            self._attr_hvac_mode = RVC_MODE_TO_HA.get(value, HVACMode.OFF)
+        elif field == "fan_mode":
+            self._attr_fan_mode = RVC_FAN_TO_HA.get(value, FAN_AUTO)
+        elif field == "setpoint_f":
+            self._attr_target_temperature = value
+
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
         temperature = kwargs.get(ATTR_TEMPERATURE)
@@ -211,8 +377,8 @@ class RVCThermostat(ClimateEntity):
         temperature = max(self._attr_min_temp, min(self._attr_max_temp, temperature))
         self._attr_target_temperature = temperature
 
-        # Publish command to bridge
-        await self._publish_command({"setpoint_f": temperature})
+        # Queue command to bridge
+        self._async_queue_command({"setpoint_f": temperature})
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set HVAC mode."""
@@ -222,9 +388,9 @@ class RVCThermostat(ClimateEntity):
 
         self._attr_hvac_mode = hvac_mode
 
-        # Publish command to bridge
+        # Queue command to bridge
         mode_code = HA_MODE_TO_RVC[hvac_mode]
-        await self._publish_command({"mode": mode_code})
+        self._async_queue_command({"mode": mode_code})
 
     async def async_set_fan_mode(self, fan_mode: str) -> None:
         """Set fan mode."""
@@ -234,9 +400,117 @@ class RVCThermostat(ClimateEntity):
 
         self._attr_fan_mode = fan_mode
 
-        # Publish command to bridge
+        # Queue command to bridge
         fan_code = HA_FAN_TO_RVC[fan_mode]
-        await self._publish_command({"fan_mode": fan_code})
+        self._async_queue_command({"fan_mode": fan_code})
+
+    @callback
+    def _async_queue_command(self, command: dict) -> None:
+        """Show the change immediately and merge it into the pending command."""
+        self.async_write_ha_state()
+        self._pending_command.update(command)
+        if self._command_handle is None:
+            self._command_handle = self.hass.loop.call_later(
+                self._command_window, self._async_command_window_closed
+            )
+
+    @callback
+    def _async_command_window_closed(self) -> None:
+        """Publish the merged command (latest value of each field)."""
+        self._command_handle = None
+        command, self._pending_command = self._pending_command, {}
+        if not command:
+            return
+        self._async_track_command(command)
+        self._entry.async_create_task(self.hass, self._publish_command(command))
+
+    @callback
+    def _async_track_command(self, command: dict) -> None:
+        """Start waiting for the coach to echo a published command."""
+        self._awaiting.update(command)
+        self._sent_at = time.monotonic()
+        self._retries = 0
+        self._async_arm_ack_timeout()
+
+    @callback
+    def async_begin_bulk_command(self, command: dict) -> asyncio.Future:
+        """Apply a command sent on the bulk topic and track its ack.
+
+        Returns a future resolving to the ack latency in ms, or None if the
+        command was not confirmed and the fields were reverted.
+        """
+        for field in command:
+            self._pending_command.pop(field, None)
+            self._apply_field(field, command[field])
+        self.async_write_ha_state()
+        self._async_track_command(command)
+        future = self.hass.loop.create_future()
+        self._ack_waiters.append(future)
+        return future
+
+    @callback
+    def _async_resolve_waiters(self, latency_ms: Optional[float]) -> None:
+        """Resolve bulk-command futures waiting on this zone."""
+        waiters, self._ack_waiters = self._ack_waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(latency_ms)
+
+    @callback
+    def _async_arm_ack_timeout(self) -> None:
+        """(Re)start the acknowledgement timer."""
+        if self._ack_handle is not None:
+            self._ack_handle.cancel()
+        self._ack_handle = self.hass.loop.call_later(
+            self._ack_timeout, self._async_ack_timeout
+        )
+
+    @callback
+    def _async_ack_timeout(self) -> None:
+        """Re-send unconfirmed fields, then revert to the reported state."""
+        self._ack_handle = None
+        if not self._awaiting:
+            return
+
+        if self._retries < COMMAND_RETRIES:
+            self._retries += 1
+            _LOGGER.warning(
+                "Thermostat %s did not confirm %s; re-sending",
+                self.instance,
+                self._awaiting,
+            )
+            self._async_arm_ack_timeout()
+            self._entry.async_create_task(
+                self.hass, self._publish_command(dict(self._awaiting))
+            )
+            return
+
+        _LOGGER.warning(
+            "Thermostat %s did not confirm %s; reverting to reported state",
+            self.instance,
+            self._awaiting,
+        )
+        for field in self._awaiting:
+            if field in self._reported:
+                self._apply_field(field, self._reported[field])
+        self._awaiting.clear()
+        self._sent_at = None
+        self.command_timeouts += 1
+        self._async_resolve_waiters(None)
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Send any merged command now and cancel acknowledgement timers."""
+        if self._command_handle is not None:
+            self._command_handle.cancel()
+            self._command_handle = None
+            command, self._pending_command = self._pending_command, {}
+            if command:
+                await self._publish_command(command)
+        if self._ack_handle is not None:
+            self._ack_handle.cancel()
+            self._ack_handle = None
+        self._async_resolve_waiters(None)
 
     async def _publish_command(self, command: dict) -> None:
         """Publish a thermostat control command to the bridge."""
@@ -0,0 +1,142 @@
+"""Payload decoding for rvcbridge topics.
+
+Kept free of Home Assistant imports so scripts can load it standalone.
+
+Formats are negotiated by topic suffix:
+  rvcbridge/<category>/<instance>           JSON (default)
+  rvcbridge/<category>/<instance>/msgpack   MessagePack map (needs msgpack)
+  rvcbridge/<category>/<instance>/struct    Fixed layout from STRUCT_LAYOUTS
+
+JSON uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from datetime import datetime
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+    JSON_BACKEND = "orjson"
+else:
+    json_loads = json.loads
+    JSON_BACKEND = "json"
+
+# Both json.JSONDecodeError and orjson.JSONDecodeError subclass ValueError
+DecodeError = ValueError
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+FORMAT_STRUCT = "struct"
+
+# Fixed little-endian layouts for numeric categories. A frame is a float64
+# timestamp, a uint8 presence mask (bit i set = field i present), then one slot
+# per field in SENSOR_MAPPINGS declaration order. Text-valued categories
+# (slide_status, awning_status) have no layout and use JSON or msgpack.
+# thermostat_status carries the raw RV-C mode/fan enums.
+STRUCT_LAYOUTS = {
+    "battery_status": (
+        ("soc_pct", "f"),
+        ("voltage_v", "f"),
+        ("current_a", "f"),
+        ("temp_c", "f"),
+    ),
+    "tank_status": (("level_pct", "f"),),
+    "zone_temperature": (("temp_f", "f"),),
+    "thermostat_setpoint": (("temp_f", "f"),),
+    "firefly_battery_v": (("voltage_v", "f"),),
+    "thermostat_status": (("mode", "B"), ("fan_mode", "B")),
+}
+
+# float32 slots are rounded back to this many decimals after unpacking
+STRUCT_FLOAT_DECIMALS = 3
+
+_STRUCT_HEADER = "<dB"
+
+# category -> (compiled Struct, tuple of (field_key, presence bit, is_float))
+_STRUCTS = {
+    category: (
+        struct.Struct(_STRUCT_HEADER + "".join(code for _, code in fields)),
+        tuple((key, 1 << bit, code == "f") for bit, (key, code) in enumerate(fields)),
+    )
+    for category, fields in STRUCT_LAYOUTS.items()
+}
+
+
+def decode_struct(category: str, payload: bytes) -> dict[str, Any]:
+    """Decode a fixed-layout frame for category into a payload dict."""
+    compiled = _STRUCTS.get(category)
+    if compiled is None:
+        raise DecodeError(f"No struct layout for category: {category}")
+    layout, fields = compiled
+    try:
+        timestamp, mask, *values = layout.unpack(payload)
+    except struct.error as err:
+        raise DecodeError(str(err)) from err
+
+    data: dict[str, Any] = {"timestamp": timestamp}
+    for (key, bit, is_float), value in zip(fields, values):
+        if mask & bit:
+            data[key] = round(value, STRUCT_FLOAT_DECIMALS) if is_float else value
+    return data
+
+
+def encode_struct(category: str, data: dict[str, Any]) -> bytes:
+    """Encode a payload dict into the category's fixed layout (bridge side)."""
+    layout, fields = _STRUCTS[category]
+    mask = 0
+    values = []
+    for key, bit, is_float in fields:
+        value = data.get(key)
+        if value is None:
+            values.append(math.nan if is_float else 0)
+        else:
+            mask |= bit
+            values.append(value)
+    return layout.pack(float(data.get("timestamp", 0.0)), mask, *values)
+
+
+def decode_payload(category: str, payload: bytes | str, fmt: str = FORMAT_JSON) -> Any:
+    """Decode a payload in the given format. Raises DecodeError on failure."""
+    if fmt == FORMAT_JSON:
+        return json_loads(payload)
+    if fmt == FORMAT_STRUCT:
+        return decode_struct(category, payload)
+    if fmt == FORMAT_MSGPACK and msgpack is not None:
+        # msgpack's unpack exceptions all subclass ValueError
+        return msgpack.unpackb(payload)
+    raise DecodeError(f"Unsupported payload format: {fmt}")
+
+
+def payload_timestamp(data: dict[str, Any]) -> Optional[float]:
+    """Bridge-side sample time (epoch seconds) from a decoded payload.
+
+    Accepts a numeric or ISO-8601 "timestamp" (documented) or "ts" (what the
+    decoder currently publishes). Returns None when absent, unset (0, as
+    packed by encode_struct) or unparseable.
+    """
+    for key in ("timestamp", "ts"):
+        value = data.get(key)
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            return float(value) if value > 0 else None
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value).timestamp()
+            except ValueError:
+                return None
+    return None
@@ -8,17 +8,32 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import selector
 
 from .const import (
+    CONF_ACK_TIMEOUT,
+    CONF_COMMAND_WINDOW,
+    CONF_DEADBANDS,
+    CONF_DISCOVER_UNKNOWN,
+    CONF_FLUSH_INTERVAL,
+    CONF_MAX_SILENCE,
     CONF_MQTT_HOST,
     CONF_MQTT_PASS,
     CONF_MQTT_PORT,
     CONF_MQTT_USER,
+    CONF_STALE_TIMEOUT,
+    CONF_ZONE_MAP,
+    CONF_ZONE_PROFILE,
+    DEFAULT_ACK_TIMEOUT,
+    DEFAULT_COMMAND_WINDOW,
+    DEFAULT_FLUSH_INTERVAL,
+    DEFAULT_MAX_SILENCE,
     DEFAULT_MQTT_HOST,
     DEFAULT_MQTT_PORT,
+    DEFAULT_STALE_TIMEOUT,
     DOMAIN,
 )
 
@@ -31,6 +46,14 @@ class RVCBridgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> RVCBridgeOptionsFlow:
+        """Return the options flow handler."""
+        return RVCBridgeOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -72,3 +95,63 @@ class RVCBridgeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> FlowResult:
         """Handle import from configuration.yaml."""
         return await self.async_step_user(import_data)
+
+
+class RVCBridgeOptionsFlow(config_entries.OptionsFlow):
+    """Options for RV-C Bridge write filtering, coalescing and discovery."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_MAX_SILENCE,
+                    default=options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                # 0 = flush coalesced state writes once per event-loop tick
+                vol.Optional(
+                    CONF_FLUSH_INTERVAL,
+                    default=options.get(CONF_FLUSH_INTERVAL, DEFAULT_FLUSH_INTERVAL),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=60)),
+                # Merge thermostat changes made within this many seconds
+                vol.Optional(
+                    CONF_COMMAND_WINDOW,
+                    default=options.get(CONF_COMMAND_WINDOW, DEFAULT_COMMAND_WINDOW),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                # Re-send, then revert, if the coach doesn't echo a command
+                vol.Optional(
+                    CONF_ACK_TIMEOUT,
+                    default=options.get(CONF_ACK_TIMEOUT, DEFAULT_ACK_TIMEOUT),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=60)),
+                # Mark entities unavailable after this many silent seconds (0 = off)
+                vol.Optional(
+                    CONF_STALE_TIMEOUT,
+                    default=options.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                # Also subscribe to rvcbridge/# to find unmapped categories
+                vol.Optional(
+                    CONF_DISCOVER_UNKNOWN,
+                    default=options.get(CONF_DISCOVER_UNKNOWN, False),
+                ): cv.boolean,
+                # {"battery_status.voltage_v": {"absolute": 0.1, "percent": 1}}
+                vol.Optional(
+                    CONF_DEADBANDS, default=options.get(CONF_DEADBANDS, {})
+                ): selector.ObjectSelector(),
+                # YAML zone profile, relative to the config dir (see zone_mappings.py)
+                vol.Optional(
+                    CONF_ZONE_PROFILE, default=options.get(CONF_ZONE_PROFILE, "")
+                ): cv.string,
+                # {"thermostat": {"5": "bay"}, "temperature": {"19": "outdoor"}}
+                vol.Optional(
+                    CONF_ZONE_MAP, default=options.get(CONF_ZONE_MAP, {})
+                ): selector.ObjectSelector(),
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=schema)
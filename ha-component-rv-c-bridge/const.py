@@ -17,6 +17,8 @@ ATTR_ENTITY_ID = "entity_id"
 ATTR_SENSOR_TYPE = "sensor_type"
 ATTR_CATEGORY = "category"
 ATTR_INSTANCE = "instance"
+ATTR_ZONES = "zones"
+ATTR_RESOLUTION = "resolution"
 
 # MQTT settings
 MQTT_TOPIC_PREFIX = "rvcbridge"
@@ -27,3 +29,129 @@ PLATFORMS = ["sensor"]
 
 # Service actions
 SERVICE_LOG_UNKNOWN_PGNS = "log_unknown_pgns"
+SERVICE_SET_ZONES = "set_zones"
+SERVICE_GET_HISTORY = "get_history"
+SERVICE_RELOAD_ZONES = "reload_zones"
+
+# State write filtering (options)
+CONF_DEADBANDS = "deadbands"
+CONF_MAX_SILENCE = "max_silence"
+
+# Heartbeat: write state at least this often (seconds) even if unchanged
+DEFAULT_MAX_SILENCE = 300
+
+# Default deadband per device_class as (absolute, percent). A reading is only
+# written when it moves past the threshold relative to the last written value.
+# Device classes not listed write on any change.
+DEFAULT_DEADBANDS = {
+    "voltage": (0.05, None),
+    "current": (0.1, None),
+    "temperature": (0.5, None),
+    "battery": (1, None),
+    "power": (5, 2),
+    "energy": (1, None),
+}
+
+# Per-field overrides keyed by "category.field"; options entries win over these
+FIELD_DEADBANDS = {
+    "battery_status.current_a": (0.2, 2),
+    "tank_status.level_pct": (1, None),
+    "tank_status.fill_rate_pct_h": (0.5, None),
+    "battery_status.time_to_empty_h": (0.1, 5),
+}
+
+# Coalesced state writes (options)
+CONF_FLUSH_INTERVAL = "flush_interval"
+
+# Seconds between scheduler flushes; 0 flushes once per event-loop tick
+DEFAULT_FLUSH_INTERVAL = 0.5
+
+# Per-category minimum seconds between writes of the same entity
+CATEGORY_MIN_UPDATE_INTERVALS = {
+    "battery_status": 1.0,
+    "firefly_battery_v": 1.0,
+}
+
+# Seconds to collect newly discovered entities before one async_add_entities()
+DISCOVERY_BATCH_WINDOW = 0.25
+
+# Seconds between diagnostic sensor refreshes
+DIAGNOSTIC_UPDATE_INTERVAL = 30
+
+# Unknown category discovery (options)
+CONF_DISCOVER_UNKNOWN = "discover_unknown"
+
+# Bounds for the unknown (category, instance) aggregator
+UNKNOWN_MAX_ENTRIES = 256
+UNKNOWN_SAMPLE_BYTES = 256
+
+# Categories HA itself publishes (commands); never recorded as unknown
+COMMAND_CATEGORIES = frozenset({"thermostat_control", "thermostat_control_bulk"})
+
+# Thermostat command coalescing (options)
+CONF_COMMAND_WINDOW = "command_window"
+
+# Seconds to merge setpoint/mode/fan changes into one thermostat_control publish
+DEFAULT_COMMAND_WINDOW = 0.3
+
+# Thermostat command acknowledgement (options)
+CONF_ACK_TIMEOUT = "ack_timeout"
+
+# Seconds to wait for a status echo before re-sending, then reverting
+DEFAULT_ACK_TIMEOUT = 5.0
+COMMAND_RETRIES = 1
+
+# Reported setpoint within this many °F of the commanded one counts as an ack
+SETPOINT_ACK_TOLERANCE = 0.5
+
+# Last-known-state snapshot (restored at startup)
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 30  # Seconds; saves are debounced
+
+# Bulk thermostat command topic (one publish for many zones)
+MQTT_TOPIC_THERMOSTAT_BULK = "rvcbridge/thermostat_control_bulk"
+
+# Per-coach zone names (options): YAML profile path and inline overrides
+CONF_ZONE_PROFILE = "zone_profile"
+CONF_ZONE_MAP = "zone_map"
+
+# Downsampled in-memory history per numeric sensor (slots per resolution)
+HISTORY_MINUTE_SLOTS = 180  # 3 hours of per-minute min/max/mean
+HISTORY_HOUR_SLOTS = 168  # 7 days of per-hour min/max/mean
+
+# Staleness detection (options); 0 disables
+CONF_STALE_TIMEOUT = "stale_timeout"
+
+# Seconds without data before an entity is marked unavailable
+DEFAULT_STALE_TIMEOUT = 600
+
+# Per-category overrides for categories the bridge publishes on a fixed cadence;
+# None for categories it only publishes on change, which are never stale
+CATEGORY_STALE_TIMEOUTS = {
+    "battery_status": 120,
+    "firefly_battery_v": 120,
+    "thermostat_status": 300,
+    "thermostat": 300,
+    "tank_status": None,
+    "slide_status": None,
+    "awning_status": None,
+    "thermostat_setpoint": None,
+}
+
+# Categories whose messages also refresh another registry category
+STALE_CATEGORY_ALIASES = {
+    "thermostat_status": "thermostat",
+    "thermostat_setpoint": "thermostat",
+}
+
+# Seconds between staleness sweeps over the registry
+STALE_SWEEP_INTERVAL = 15
+
+# Payload timestamps further than this from HA's clock are treated as skewed
+CLOCK_SKEW_TOLERANCE = 60
+
+# Payload timestamps this far ahead of HA's clock (seconds) indicate skew
+CLOCK_SKEW_NEGATIVE_TOLERANCE = 0.5
+
+# Latest bridge -> HA latency samples kept per category for percentiles
+LATENCY_WINDOW_SIZE = 256
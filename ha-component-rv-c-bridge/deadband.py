@@ -0,0 +1,74 @@
+"""Per-field deadband / change detection for RV-C Bridge state writes.
+
+The bridge republishes readings that are unchanged or only jitter in the last
+decimal. A Deadband decides whether a new value is worth a state write, based
+on the last value actually written and how long ago that write happened.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Mapping, Optional
+
+from .const import (
+    CONF_DEADBANDS,
+    CONF_MAX_SILENCE,
+    DEFAULT_DEADBANDS,
+    DEFAULT_MAX_SILENCE,
+    FIELD_DEADBANDS,
+)
+
+
+class Deadband:
+    """Absolute/percent threshold with a heartbeat (max silence) interval."""
+
+    __slots__ = ("absolute", "percent", "max_silence")
+
+    def __init__(
+        self,
+        absolute: Optional[float] = None,
+        percent: Optional[float] = None,
+        max_silence: float = DEFAULT_MAX_SILENCE,
+    ):
+        """Initialize the deadband."""
+        self.absolute = absolute
+        self.percent = percent
+        self.max_silence = max_silence
+
+    def should_write(self, last: Any, value: Any, elapsed: float) -> bool:
+        """Return True if value differs enough from last (or heartbeat is due)."""
+        if last is None or elapsed >= self.max_silence:
+            return True
+        if value == last:
+            return False
+        try:
+            delta = abs(value - last)
+        except TypeError:
+            # Non-numeric (mode strings etc.): any change is a change
+            return True
+
+        limit = self.absolute or 0
+        if self.percent:
+            limit = max(limit, abs(last) * self.percent / 100)
+        return delta > limit
+
+
+def resolve_deadband(
+    category: str,
+    field_key: str,
+    device_class: Optional[str],
+    options: Mapping[str, Any],
+) -> Deadband:
+    """Resolve the deadband for a field: options > FIELD_DEADBANDS > device_class."""
+    max_silence = options.get(CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE)
+    key = f"{category}.{field_key}"
+
+    override = options.get(CONF_DEADBANDS, {}).get(key)
+    if override is not None:
+        return Deadband(
+            override.get("absolute"), override.get("percent"), max_silence
+        )
+
+    absolute, percent = FIELD_DEADBANDS.get(
+        key, DEFAULT_DEADBANDS.get(device_class, (None, None))
+    )
+    return Deadband(absolute, percent, max_silence)
@@ -0,0 +1,144 @@
+"""Streaming derived quantities computed in the ingest path.
+
+Calculators keep a few floats of state per (category, instance) and update in
+O(1) per sample, replacing template sensors built on top of battery_status and
+tank_status. Sample times come from the payload timestamp when present.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Any, Optional
+
+from .codec import payload_timestamp
+
+# Gaps longer than this (seconds) are not integrated/differentiated across
+MAX_SAMPLE_GAP = 300
+
+# Time constant (seconds) for smoothing SOC and tank level rates
+RATE_TIME_CONSTANT = 900
+
+
+def sample_time(data: dict[str, Any]) -> float:
+    """Payload timestamp (epoch seconds) if present, else receive time."""
+    ts = payload_timestamp(data)
+    return time.time() if ts is None else ts
+
+
+class SmoothedRate:
+    """Exponentially smoothed rate of change, in units per hour."""
+
+    __slots__ = ("rate", "_last_ts", "_last_value")
+
+    def __init__(self):
+        """Initialize with no samples."""
+        self.rate: Optional[float] = None
+        self._last_ts: Optional[float] = None
+        self._last_value: Optional[float] = None
+
+    def update(self, ts: float, value: float) -> Optional[float]:
+        """Fold in a sample; return the smoothed rate (per hour)."""
+        last_ts, last_value = self._last_ts, self._last_value
+        self._last_ts, self._last_value = ts, value
+        if last_ts is None:
+            return self.rate
+        dt = ts - last_ts
+        if dt <= 0:
+            return self.rate
+        if dt > MAX_SAMPLE_GAP:
+            self.rate = None
+            return None
+
+        instant = (value - last_value) * 3600 / dt
+        if self.rate is None:
+            self.rate = instant
+        else:
+            alpha = 1 - math.exp(-dt / RATE_TIME_CONSTANT)
+            self.rate += alpha * (instant - self.rate)
+        return self.rate
+
+
+class BatteryCalculator:
+    """Power, trapezoidal energy in/out and time-to-empty for one battery."""
+
+    __slots__ = (
+        "voltage",
+        "current",
+        "energy_in",
+        "energy_out",
+        "_last_ts",
+        "_last_power",
+        "_soc_rate",
+    )
+
+    def __init__(self):
+        """Initialize counters."""
+        self.voltage: Optional[float] = None
+        self.current: Optional[float] = None
+        self.energy_in = 0.0
+        self.energy_out = 0.0
+        self._last_ts: Optional[float] = None
+        self._last_power: Optional[float] = None
+        self._soc_rate = SmoothedRate()
+
+    def restore(self, key: str, value: Any) -> None:
+        """Seed running totals from the snapshot."""
+        if key == "energy_in_wh":
+            self.energy_in = float(value)
+        elif key == "energy_out_wh":
+            self.energy_out = float(value)
+
+    def update(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Fold in one battery_status payload; return changed outputs."""
+        ts = sample_time(data)
+        out: dict[str, Any] = {}
+        if "voltage_v" in data:
+            self.voltage = data["voltage_v"]
+        if "current_a" in data:
+            self.current = data["current_a"]
+
+        if self.voltage is not None and self.current is not None:
+            # Positive current charges the battery
+            power = self.voltage * self.current
+            out["power_w"] = round(power, 1)
+            last_ts, last_power = self._last_ts, self._last_power
+            if last_ts is not None and 0 < ts - last_ts <= MAX_SAMPLE_GAP:
+                wh = (last_power + power) / 2 * (ts - last_ts) / 3600
+                if wh >= 0:
+                    self.energy_in += wh
+                else:
+                    self.energy_out -= wh
+                out["energy_in_wh"] = round(self.energy_in, 2)
+                out["energy_out_wh"] = round(self.energy_out, 2)
+            self._last_ts, self._last_power = ts, power
+
+        soc = data.get("soc_pct")
+        if isinstance(soc, (int, float)):
+            rate = self._soc_rate.update(ts, soc)
+            if rate is not None:
+                out["time_to_empty_h"] = (
+                    round(soc / -rate, 1) if rate < 0 else None
+                )
+        return out
+
+
+class TankCalculator:
+    """Fill (+) / drain (-) rate for one tank, in % per hour."""
+
+    __slots__ = ("_rate",)
+
+    def __init__(self):
+        """Initialize the rate tracker."""
+        self._rate = SmoothedRate()
+
+    def restore(self, key: str, value: Any) -> None:
+        """Nothing to seed; rates rebuild from live samples."""
+
+    def update(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Fold in one tank_status payload; return changed outputs."""
+        level = data.get("level_pct")
+        if not isinstance(level, (int, float)):
+            return {}
+        rate = self._rate.update(sample_time(data), level)
+        return {} if rate is None else {"fill_rate_pct_h": round(rate, 2)}
@@ -0,0 +1,43 @@
+"""Config-entry diagnostics for RV-C Bridge."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .codec import JSON_BACKEND
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return ingress and state-write statistics for the entry."""
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    scheduler = entry_data["write_scheduler"]
+
+    return {
+        "options": dict(entry.options),
+        "json_backend": JSON_BACKEND,
+        "entities": len(entry_data["registry"]),
+        "zones": entry_data["zones"].as_dict(),
+        "ingress": entry_data["ingress"].stats.as_dict(),
+        "stale_sources": (
+            entry_data["staleness"].stale_sources if entry_data["staleness"] else []
+        ),
+        "thermostat_commands": {
+            record.key[1]: {
+                "latency": record.entity.command_latency.as_dict(),
+                "timeouts": record.entity.command_timeouts,
+            }
+            for record in entry_data["registry"]
+            if record.key[0] == "thermostat"
+        },
+        "state_writes": {
+            **entry_data["write_stats"],
+            "flushes": scheduler.flushes,
+            "writes": scheduler.writes,
+        },
+    }
@@ -0,0 +1,77 @@
+"""Batched entity registration for RV-C Bridge discovery.
+
+On a cold start the broker replays retained messages for every category and
+instance within a few hundred milliseconds. Instead of one async_add_entities()
+per discovered entity, platforms hand new entities to an EntityBatcher which
+registers everything found within a short window in a single call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DISCOVERY_BATCH_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class EntityBatcher:
+    """Collect new entities and add them with one call per batching window."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        async_add_entities: AddEntitiesCallback,
+        platform: str,
+        setup_started: float,
+        window: float = DISCOVERY_BATCH_WINDOW,
+    ):
+        """Initialize the batcher."""
+        self._hass = hass
+        self._async_add_entities = async_add_entities
+        self._platform = platform
+        self._setup_started = setup_started
+        self._window = window
+        self._pending: list[Entity] = []
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self.total = 0
+
+    @callback
+    def async_add(self, entity: Entity) -> None:
+        """Queue a newly discovered entity for registration."""
+        self._pending.append(entity)
+        if self._handle is None:
+            self._handle = self._hass.loop.call_later(self._window, self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Register all queued entities in one platform call."""
+        self._handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self._async_add_entities(batch, update_before_add=False)
+        self.total += len(batch)
+        _LOGGER.info(
+            "Registered %d %s entities in one batch (%d total, %.2fs since setup)",
+            len(batch),
+            self._platform,
+            self.total,
+            time.monotonic() - self._setup_started,
+        )
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel a pending batch."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
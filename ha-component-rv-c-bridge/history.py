@@ -0,0 +1,92 @@
+"""In-memory downsampled history for RV-C Bridge sensors.
+
+Each numeric sensor keeps fixed-size, array-backed ring buffers of per-minute
+and per-hour min/max/mean. Recording a sample is O(1) and memory is fixed, so
+raw high-rate fields can be excluded from the recorder while trend views are
+served from here (see the get_history service).
+"""
+
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import HISTORY_HOUR_SLOTS, HISTORY_MINUTE_SLOTS
+
+
+class RingBuffer:
+    """Fixed number of time buckets, each with min/max/sum/count."""
+
+    __slots__ = ("period", "size", "starts", "mins", "maxs", "sums", "counts", "head")
+
+    def __init__(self, period: int, size: int):
+        """Initialize empty buckets of period seconds."""
+        self.period = period
+        self.size = size
+        self.starts = array("q", [-1]) * size
+        self.mins = array("d", [0.0]) * size
+        self.maxs = array("d", [0.0]) * size
+        self.sums = array("d", [0.0]) * size
+        self.counts = array("q", [0]) * size
+        self.head = 0
+
+    def add(self, ts: float, value: float) -> None:
+        """Fold one sample into its bucket."""
+        start = int(ts) // self.period * self.period
+        head = self.head
+        current = self.starts[head]
+        if start != current:
+            if start < current:
+                # Late sample for an older bucket; drop rather than rewind
+                return
+            head = self.head = (head + 1) % self.size
+            self.starts[head] = start
+            self.mins[head] = self.maxs[head] = value
+            self.sums[head] = value
+            self.counts[head] = 1
+            return
+
+        if value < self.mins[head]:
+            self.mins[head] = value
+        elif value > self.maxs[head]:
+            self.maxs[head] = value
+        self.sums[head] += value
+        self.counts[head] += 1
+
+    def buckets(self) -> list[dict[str, Any]]:
+        """Return filled buckets, oldest first."""
+        result = []
+        for offset in range(1, self.size + 1):
+            i = (self.head + offset) % self.size
+            if self.starts[i] < 0:
+                continue
+            result.append(
+                {
+                    "start": datetime.fromtimestamp(
+                        self.starts[i], timezone.utc
+                    ).isoformat(),
+                    "min": self.mins[i],
+                    "max": self.maxs[i],
+                    "mean": round(self.sums[i] / self.counts[i], 3),
+                    "count": self.counts[i],
+                }
+            )
+        return result
+
+
+class SensorHistory:
+    """Per-minute and per-hour ring buffers for one sensor."""
+
+    __slots__ = ("minute", "hour")
+
+    def __init__(self):
+        """Initialize both resolutions."""
+        self.minute = RingBuffer(60, HISTORY_MINUTE_SLOTS)
+        self.hour = RingBuffer(3600, HISTORY_HOUR_SLOTS)
+
+    def add(self, ts: float, value: Any) -> None:
+        """Record a numeric sample; non-numeric values are ignored."""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.minute.add(ts, value)
+            self.hour.add(ts, value)
@@ -0,0 +1,160 @@
+"""Shared MQTT ingress for the RV-C Bridge integration.
+
+Owns one subscription per consumed category and decodes each payload once.
+Platforms register handlers per category; parsed payloads are fanned out to
+every handler for that category (e.g. thermostat_status feeds both the sensor
+and climate platforms from a single decode). Payloads are received as bytes so
+compact formats selected by topic suffix (see codec.py) decode on the same path.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable
+
+from homeassistant.components import mqtt
+from homeassistant.core import HomeAssistant, callback
+
+from .codec import (
+    FORMAT_JSON,
+    JSON_BACKEND,
+    DecodeError,
+    decode_payload,
+    json_loads,
+    payload_timestamp,
+)
+from .const import COMMAND_CATEGORIES, MQTT_TOPIC_PREFIX
+from .staleness import StalenessTracker
+from .stats import CategoryStats, IngressStats
+from .unknown import UnknownAggregator
+
+_LOGGER = logging.getLogger(__name__)
+
+# handler(category, instance, data)
+IngressHandler = Callable[[str, str, dict[str, Any]], None]
+
+
+class RVCIngress:
+    """Single subscription + decode point, dispatching by category."""
+
+    def __init__(
+        self, hass: HomeAssistant, staleness: StalenessTracker | None = None
+    ):
+        """Initialize the ingress."""
+        self._hass = hass
+        self._staleness = staleness
+        self._handlers: dict[str, tuple[IngressHandler, ...]] = {}
+        self._unsubscribes: list[Callable[[], None]] = []
+        self.stats = IngressStats()
+        self._unknown: UnknownAggregator | None = None
+
+    @callback
+    def async_register(self, category: str, handler: IngressHandler) -> None:
+        """Register a consumer for a category. Call before async_start()."""
+        self._handlers[category] = self._handlers.get(category, ()) + (handler,)
+        self.stats.categories.setdefault(category, CategoryStats())
+
+    async def async_start(self, unknown: UnknownAggregator | None = None) -> None:
+        """Subscribe to every registered category.
+
+        With an aggregator, also subscribe to the rvcbridge/# firehose and
+        record categories nobody consumes (discovery mode; costs one extra
+        callback per mapped message, without decoding).
+        """
+        for category in self._handlers:
+            self._unsubscribes.append(
+                await mqtt.async_subscribe(
+                    self._hass,
+                    f"{MQTT_TOPIC_PREFIX}/{category}/#",
+                    self._async_handle_message,
+                    0,
+                    encoding=None,
+                )
+            )
+        if unknown is not None:
+            self._unknown = unknown
+            self._unsubscribes.append(
+                await mqtt.async_subscribe(
+                    self._hass,
+                    f"{MQTT_TOPIC_PREFIX}/#",
+                    self._async_handle_unknown,
+                    0,
+                    encoding=None,
+                )
+            )
+        _LOGGER.info(
+            "Subscribed to %d rvcbridge categories (JSON backend: %s)",
+            len(self._handlers),
+            JSON_BACKEND,
+        )
+
+    @callback
+    def _async_handle_message(self, msg: mqtt.ReceiveMessage) -> None:
+        """Decode once and fan out to the category's handlers."""
+        stats = self.stats
+        stats.received += 1
+        # Topic: rvcbridge/category/instance[/format]
+        parts = msg.topic.split("/")
+        if len(parts) == 3:
+            _, category, instance = parts
+            fmt = FORMAT_JSON
+        elif len(parts) == 4:
+            _, category, instance, fmt = parts
+        else:
+            stats.dropped_unmapped += 1
+            return
+
+        handlers = self._handlers.get(category)
+        if handlers is None:
+            stats.dropped_unmapped += 1
+            return
+        category_stats = stats.categories[category]
+        category_stats.messages += 1
+
+        start = time.perf_counter_ns()
+        try:
+            if fmt == FORMAT_JSON:
+                data = json_loads(msg.payload)
+            else:
+                data = decode_payload(category, msg.payload, fmt)
+        except DecodeError:
+            data = None
+        decoded = time.perf_counter_ns()
+        category_stats.decode.observe(decoded - start)
+
+        if not isinstance(data, dict):
+            stats.dropped_bad_payload += 1
+            _LOGGER.warning("Failed to decode payload from %s: %r", msg.topic, msg.payload)
+            return
+        stats.decoded += 1
+
+        # Bridge -> HA delivery latency from the payload's sample time; retained
+        # messages replayed on subscribe are old by design, not delayed
+        stamp = payload_timestamp(data)
+        if stamp is not None and not msg.retain:
+            category_stats.latency.observe(time.time() - stamp)
+        if self._staleness is not None:
+            self._staleness.async_mark_seen(category, instance, stamp)
+
+        for handler in handlers:
+            handler(category, instance, data)
+        category_stats.handler.observe(time.perf_counter_ns() - decoded)
+
+    @callback
+    def _async_handle_unknown(self, msg: mqtt.ReceiveMessage) -> None:
+        """Record firehose messages for categories without a consumer."""
+        parts = msg.topic.split("/", 3)
+        if (
+            len(parts) < 3
+            or parts[1] in self._handlers
+            or parts[1] in COMMAND_CATEGORIES  # Our own publishes echoed back
+        ):
+            return
+        self._unknown.record(parts[1], parts[2], msg.payload)
+
+    @callback
+    def async_stop(self) -> None:
+        """Release all subscriptions."""
+        while self._unsubscribes:
+            self._unsubscribes.pop()()
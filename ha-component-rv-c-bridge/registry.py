@@ -0,0 +1,65 @@
+"""Per-entry registry of RV-C Bridge entities and their hot-path state.
+
+Entities are keyed by interned (category, instance, field) tuples, so the
+message path never formats entity id strings. Each entry is a compact
+__slots__ record holding the entity and the per-entity state that hot-path
+features (deadband, scheduling, staleness) share.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Iterator, Optional
+
+from homeassistant.helpers.entity import Entity
+
+# (category, instance, field); climate entities use ("thermostat", instance, "climate")
+RegistryKey = tuple[str, str, str]
+
+
+class EntityRecord:
+    """Compact per-entity state kept alongside the entity."""
+
+    __slots__ = ("key", "entity", "last_value", "last_write", "suppressed")
+
+    def __init__(self, key: RegistryKey, entity: Entity):
+        """Initialize the record."""
+        self.key = key
+        self.entity = entity
+        self.last_value: Any = None  # Last value written to HA
+        self.last_write = 0.0  # time.monotonic() of that write
+        self.suppressed = 0  # Updates skipped by the deadband
+
+
+class RVCRegistry:
+    """Tuple-keyed registry of EntityRecords."""
+
+    __slots__ = ("_records",)
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self._records: dict[RegistryKey, EntityRecord] = {}
+
+    def get(self, key: RegistryKey) -> Optional[EntityRecord]:
+        """Return the record for key, or None if not discovered yet."""
+        return self._records.get(key)
+
+    def add(self, key: RegistryKey, entity: Entity) -> EntityRecord:
+        """Register an entity under an interned key and bind entity.record."""
+        key = (sys.intern(key[0]), sys.intern(key[1]), sys.intern(key[2]))
+        record = EntityRecord(key, entity)
+        self._records[key] = record
+        entity.record = record
+        return record
+
+    def __contains__(self, key: RegistryKey) -> bool:
+        """Return True if key is registered."""
+        return key in self._records
+
+    def __iter__(self) -> Iterator[EntityRecord]:
+        """Iterate over all records."""
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        """Return the number of registered entities."""
+        return len(self._records)
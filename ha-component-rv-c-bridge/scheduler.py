@@ -0,0 +1,92 @@
+"""Coalescing state-write scheduler for RV-C Bridge entities.
+
+Entities mark themselves dirty instead of calling async_write_ha_state()
+directly. The scheduler flushes dirty entities at most once per interval (or
+once per event-loop tick when the interval is 0). A flush always writes the
+entity's current, i.e. newest, value, so bursts collapse into one write.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import Entity
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateWriteScheduler:
+    """Batch async_write_ha_state() calls for the integration's entities."""
+
+    def __init__(self, hass: HomeAssistant, interval: float = 0.0):
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._interval = interval
+        self._dirty: dict[Entity, None] = {}  # Insertion-ordered set
+        self._last_write: dict[Entity, float] = {}
+        self._handle: Optional[asyncio.TimerHandle | asyncio.Handle] = None
+        self.flushes = 0
+        self.writes = 0
+
+    @callback
+    def async_schedule(self, entity: Entity) -> None:
+        """Mark an entity dirty; it is written on the next flush."""
+        self._dirty[entity] = None
+        if self._handle is None:
+            self._arm(self._interval)
+
+    def _arm(self, delay: float) -> None:
+        """Schedule the next flush."""
+        if delay > 0:
+            self._handle = self._hass.loop.call_later(delay, self._async_flush)
+        else:
+            self._handle = self._hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Write every dirty entity whose minimum update interval has passed."""
+        self._handle = None
+        self.flushes += 1
+        now = time.monotonic()
+        dirty, self._dirty = self._dirty, {}
+        next_due: Optional[float] = None
+
+        for entity in dirty:
+            # Not added to HA yet; the platform writes the current state on add
+            if entity.hass is None or entity.platform is None:
+                continue
+
+            min_interval = getattr(entity, "min_update_interval", 0.0)
+            if min_interval:
+                wait = self._last_write.get(entity, 0.0) + min_interval - now
+                if wait > 0:
+                    # Keep it dirty so the final value is still published
+                    self._dirty[entity] = None
+                    next_due = wait if next_due is None else min(next_due, wait)
+                    continue
+                self._last_write[entity] = now
+
+            entity.async_write_ha_state()
+            self.writes += 1
+
+        if next_due is not None:
+            self._arm(max(next_due, self._interval))
+
+    @callback
+    def async_forget(self, entity: Entity) -> None:
+        """Drop an entity (e.g. on removal)."""
+        self._dirty.pop(entity, None)
+        self._last_write.pop(entity, None)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel any pending flush."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._dirty.clear()
+        self._last_write.clear()
@@ -18,15 +18,26 @@ Or simplified:
   "voltage_v": 13.5,
   "current_a": 5.2
 }
+
+Numeric sensors keep per-minute/per-hour min/max/mean in memory (history.py),
+served by the rv_c_bridge.get_history service. High-rate raw fields can then
+be excluded from the recorder, e.g.:
+
+recorder:
+  exclude:
+    entity_globs:
+      - sensor.rv_battery_status_voltage_*
+      - sensor.rv_battery_status_current_*
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import time
+from datetime import timedelta
+from functools import partial
 from typing import Any, Optional
 
-from homeassistant.components import mqtt
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -34,12 +45,25 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_NAME, Platform
+from homeassistant.const import CONF_NAME, EntityCategory, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
 
-from .const import DOMAIN
+from .const import (
+    CATEGORY_MIN_UPDATE_INTERVALS,
+    DIAGNOSTIC_UPDATE_INTERVAL,
+    DOMAIN,
+    MQTT_TOPIC_PREFIX,
+)
+from .deadband import Deadband, resolve_deadband
+from .derived import BatteryCalculator, TankCalculator
+from .discovery import EntityBatcher
+from .history import SensorHistory
+from .registry import EntityRecord
+from .scheduler import StateWriteScheduler
+from .zone_mappings import CATEGORY_ZONE_CONTEXTS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -84,6 +108,187 @@ SENSOR_MAPPINGS = {
 }
 
 
+# Derived sensors computed incrementally from mapped fields (derived.py):
+# category -> (calculator class, {key: (name, device_class, icon, unit, state_class)})
+# One calculator instance is kept per (category, instance).
+DERIVED_MAPPINGS = {
+    "battery_status": (
+        BatteryCalculator,
+        {
+            "power_w": (
+                "Power",
+                "power",
+                "mdi:flash",
+                "W",
+                SensorStateClass.MEASUREMENT,
+            ),
+            "energy_in_wh": (
+                "Energy In",
+                "energy",
+                "mdi:battery-arrow-up",
+                "Wh",
+                SensorStateClass.TOTAL_INCREASING,
+            ),
+            "energy_out_wh": (
+                "Energy Out",
+                "energy",
+                "mdi:battery-arrow-down",
+                "Wh",
+                SensorStateClass.TOTAL_INCREASING,
+            ),
+            "time_to_empty_h": (
+                "Time To Empty",
+                "duration",
+                "mdi:timer-sand",
+                "h",
+                SensorStateClass.MEASUREMENT,
+            ),
+        },
+    ),
+    "tank_status": (
+        TankCalculator,
+        {
+            "fill_rate_pct_h": (
+                "Fill Rate",
+                None,
+                "mdi:water-sync",
+                "%/h",
+                SensorStateClass.MEASUREMENT,
+            ),
+        },
+    ),
+}
+
+# Integration health sensors: key -> (name, icon, unit, state_class, value_fn).
+# value_fn reads the config entry's hass.data dict.
+DIAGNOSTIC_SENSORS = {
+    "messages_received": (
+        "Messages Received",
+        "mdi:message-arrow-left",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda d: d["ingress"].stats.received,
+    ),
+    "messages_decoded": (
+        "Messages Decoded",
+        "mdi:code-json",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda d: d["ingress"].stats.decoded,
+    ),
+    "messages_dropped": (
+        "Messages Dropped",
+        "mdi:message-alert",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda d: d["ingress"].stats.dropped_unmapped
+        + d["ingress"].stats.dropped_bad_payload,
+    ),
+    "state_writes": (
+        "State Writes",
+        "mdi:database-arrow-down",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda d: d["write_scheduler"].writes,
+    ),
+    "writes_suppressed": (
+        "Writes Suppressed",
+        "mdi:filter",
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda d: d["write_stats"]["suppressed"],
+    ),
+    "handler_time": (
+        "Handler Time",
+        "mdi:timer-outline",
+        "µs",
+        SensorStateClass.MEASUREMENT,
+        lambda d: _mean_handler_us(d["ingress"].stats),
+    ),
+    "bridge_latency": (
+        "Bridge Latency",
+        "mdi:timer-sync-outline",
+        "ms",
+        SensorStateClass.MEASUREMENT,
+        lambda d: _worst_latency_p90_ms(d["ingress"].stats),
+    ),
+}
+
+# Extra attributes for diagnostic sensors: key -> attributes_fn(entry_data)
+DIAGNOSTIC_ATTRIBUTES = {
+    "bridge_latency": lambda d: {
+        "clock_skew": [
+            category
+            for category, category_stats in d["ingress"].stats.categories.items()
+            if category_stats.latency.clock_skew
+        ],
+        "categories": {
+            category: category_stats.latency.percentiles_ms()
+            for category, category_stats in d["ingress"].stats.categories.items()
+            if category_stats.latency.filled
+        },
+    },
+}
+
+
+def _mean_handler_us(stats) -> float:
+    """Mean decode + handler time per message across categories."""
+    count = total_ns = 0
+    for category_stats in stats.categories.values():
+        count += category_stats.decode.count
+        total_ns += category_stats.decode.total_ns + category_stats.handler.total_ns
+    return round(total_ns / count / 1000, 1) if count else 0.0
+
+
+def _worst_latency_p90_ms(stats) -> Optional[float]:
+    """Highest per-category p90 bridge -> HA latency, None without timestamps."""
+    worst = None
+    for category_stats in stats.categories.values():
+        p90 = category_stats.latency.percentiles_ms((90,)).get("p90_ms")
+        if p90 is not None and (worst is None or p90 > worst):
+            worst = p90
+    return worst
+
+
+# Precompiled dispatch table: category -> tuple of resolved field extractors
+# (field_key, display name, device_class, icon, unit, state_class). Built once
+# at import so the message path does one dict lookup instead of walking
+# SENSOR_MAPPINGS.
+SENSOR_DISPATCH = {
+    category: tuple(
+        (
+            field_key,
+            f"{category.replace('_', ' ').title()} {field_name}",
+            device_class,
+            icon,
+            unit,
+            SensorStateClass.MEASUREMENT,
+        )
+        for field_key, (field_name, device_class, icon, unit) in fields.items()
+    )
+    for category, fields in SENSOR_MAPPINGS.items()
+}
+
+# Same shape for derived outputs: category -> (calculator class, {key: field})
+DERIVED_DISPATCH = {
+    category: (
+        calculator,
+        {
+            key: (
+                key,
+                f"{category.replace('_', ' ').title()} {name}",
+                device_class,
+                icon,
+                unit,
+                state_class,
+            )
+            for key, (name, device_class, icon, unit, state_class) in outputs.items()
+        },
+    )
+    for category, (calculator, outputs) in DERIVED_MAPPINGS.items()
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -92,67 +297,144 @@ async def async_setup_entry(
     """Set up RV-C Bridge sensors from MQTT."""
     _LOGGER.info("Setting up RV-C Bridge MQTT sensors")
 
-    registry = hass.data[DOMAIN][entry.entry_id]["sensor_registry"]
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+    registry = entry_data["registry"]
+    write_stats = entry_data["write_stats"]
+    scheduler = entry_data["write_scheduler"]
+    zones = entry_data["zones"]
+    batcher = EntityBatcher(
+        hass, async_add_entities, "sensor", entry_data["setup_started"]
+    )
+    entry.async_on_unload(batcher.async_shutdown)
 
-    @callback
-    def async_handle_mqtt_message(msg: mqtt.ReceiveMessage) -> None:
-        """Handle incoming MQTT message from rvcbridge/*."""
-        topic = msg.topic
-        payload = msg.payload
-
-        # Parse topic: rvcbridge/category/instance
-        parts = topic.split("/")
-        if len(parts) != 3 or parts[0] != "rvcbridge":
-            _LOGGER.debug(f"Ignoring non-RV-C topic: {topic}")
-            return
+    snapshot = entry_data["snapshot"]
 
-        category = parts[1]
-        instance = parts[2]
+    @callback
+    def _async_create_sensor(
+        category: str, instance: str, field: tuple
+    ) -> EntityRecord:
+        """Create, register and queue the sensor for one field."""
+        field_key, label, device_class, icon, unit, state_class = field
+        entity_id = f"{category}_{instance}_{field_key}"
+        # Zone categories are named after the coach's zone, resolved once here
+        context = CATEGORY_ZONE_CONTEXTS.get(category)
+        zone = zones.lookup(instance, context) if context else None
+        suffix = zone.replace("_", " ").title() if zone else instance
+        sensor = RVCBridgeSensor(
+            entry_id=entry.entry_id,
+            topic=f"{MQTT_TOPIC_PREFIX}/{category}/{instance}",
+            entity_id=entity_id,
+            name=f"RV {label} ({suffix})",
+            field_key=field_key,
+            device_class=device_class,
+            unit=unit,
+            icon=icon,
+            state_class=state_class,
+            deadband=resolve_deadband(
+                category, field_key, device_class, entry.options
+            ),
+            write_stats=write_stats,
+            scheduler=scheduler,
+            min_update_interval=CATEGORY_MIN_UPDATE_INTERVALS.get(category, 0.0),
+        )
+        record = registry.add((category, instance, field_key), sensor)
+        batcher.async_add(sensor)
+        _LOGGER.debug("Discovered sensor: %s", entity_id)
+        return record
 
-        try:
-            data = json.loads(payload)
-        except json.JSONDecodeError:
-            _LOGGER.warning(f"Failed to decode JSON from {topic}: {payload}")
-            return
+    calculators: dict[tuple[str, str], Any] = {}
 
-        _LOGGER.debug(f"MQTT {topic}: {data}")
+    @callback
+    def _async_get_calculator(category: str, instance: str) -> Any:
+        """Return the derived-quantity calculator for a category instance."""
+        calculator = calculators.get((category, instance))
+        if calculator is None:
+            calculator = calculators[(category, instance)] = DERIVED_DISPATCH[
+                category
+            ][0]()
+        return calculator
 
-        # Check if we have a mapping for this category
-        if category not in SENSOR_MAPPINGS:
-            _LOGGER.debug(f"No mapping for category: {category}")
-            return
+    @callback
+    def async_handle_fields(
+        fields: tuple,
+        derived: Optional[dict[str, tuple]],
+        category: str,
+        instance: str,
+        data: dict[str, Any],
+    ) -> None:
+        """Handle a decoded rvcbridge/{category}/{instance} payload."""
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("MQTT %s/%s: %s", category, instance, data)
 
-        # For each field in the data, create a sensor entity
-        for field_key, (field_name, device_class, icon, unit) in SENSOR_MAPPINGS[
-            category
-        ].items():
+        # For each mapped field present in the data, create/update a sensor
+        for field in fields:
+            field_key = field[0]
             if field_key not in data:
                 continue
 
-            entity_id = f"{category}_{instance}_{field_key}"
-
-            if entity_id not in registry:
-                sensor = RVCBridgeSensor(
-                    entry_id=entry.entry_id,
-                    topic=topic,
-                    entity_id=entity_id,
-                    name=f"RV {category.replace('_', ' ').title()} {field_name} ({instance})",
-                    field_key=field_key,
-                    device_class=device_class,
-                    unit=unit,
-                    icon=icon,
-                )
-                registry[entity_id] = sensor
-                async_add_entities([sensor], update_before_add=False)
-                _LOGGER.info(f"Created sensor: {entity_id}")
+            record = registry.get((category, instance, field_key))
+            if record is None:
+                record = _async_create_sensor(category, instance, field)
 
             # Update the sensor with new value
-            sensor = registry[entity_id]
-            sensor.async_update_state(data[field_key])
+            record.entity.async_update_state(data[field_key])
+
+        if derived is not None:
+            # Derived outputs (power, energy, rates) in O(1) per sample
+            outputs = _async_get_calculator(category, instance).update(data)
+            for key, value in outputs.items():
+                record = registry.get((category, instance, key))
+                if record is None:
+                    if value is None:
+                        continue
+                    record = _async_create_sensor(category, instance, derived[key])
+                record.entity.async_update_state(value)
+        snapshot.async_mark_dirty()
+
+    # Hydrate sensors from the last snapshot; live data replaces these values
+    for category, instance, field_key, value in snapshot.restored.get("sensors", []):
+        field = next(
+            (f for f in SENSOR_DISPATCH.get(category, ()) if f[0] == field_key), None
+        )
+        if field is None and category in DERIVED_DISPATCH:
+            field = DERIVED_DISPATCH[category][1].get(field_key)
+            if field is not None:
+                _async_get_calculator(category, instance).restore(field_key, value)
+        if field is None or (category, instance, field_key) in registry:
+            continue
+        record = _async_create_sensor(category, instance, field)
+        record.entity.async_restore_state(value)
+
+    # Register each mapped category with the shared ingress; the handler is
+    # pre-bound to the category's resolved field extractors
+    ingress = entry_data["ingress"]
+    for category, fields in SENSOR_DISPATCH.items():
+        derived = DERIVED_DISPATCH[category][1] if category in DERIVED_DISPATCH else None
+        ingress.async_register(
+            category, partial(async_handle_fields, fields, derived)
+        )
+
+    # Diagnostic sensors share one refresh timer
+    diagnostics = [
+        RVCBridgeDiagnosticSensor(entry.entry_id, entry_data, key, *description)
+        for key, description in DIAGNOSTIC_SENSORS.items()
+    ]
+    async_add_entities(diagnostics, update_before_add=True)
 
-    # Subscribe to rvcbridge/# and handle all messages
-    await mqtt.async_subscribe(hass, "rvcbridge/#", async_handle_mqtt_message, 0)
-    _LOGGER.info("Subscribed to rvcbridge/# MQTT topic")
+    @callback
+    def async_refresh_diagnostics(_now) -> None:
+        """Refresh every diagnostic sensor."""
+        for sensor in diagnostics:
+            if sensor.hass is not None:
+                sensor.async_refresh()
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass,
+            async_refresh_diagnostics,
+            timedelta(seconds=DIAGNOSTIC_UPDATE_INTERVAL),
+        )
+    )
 
 
 class RVCBridgeSensor(SensorEntity):
@@ -168,6 +450,11 @@ class RVCBridgeSensor(SensorEntity):
         device_class: Optional[str],
         unit: Optional[str],
         icon: str,
+        state_class: SensorStateClass,
+        deadband: Deadband,
+        write_stats: dict[str, int],
+        scheduler: StateWriteScheduler,
+        min_update_interval: float = 0.0,
     ):
         """Initialize the sensor."""
         self.entry_id = entry_id
@@ -177,10 +464,25 @@ class RVCBridgeSensor(SensorEntity):
         self._attr_icon = icon
         self._attr_unit_of_measurement = unit
         self._attr_device_class = device_class
-        self._attr_state_class = SensorStateClass.MEASUREMENT
+        self._attr_state_class = state_class
         self._attr_native_unit_of_measurement = unit
         self._current_state: StateType = None
 
+        # Change detection: compare against the last value actually written
+        self._deadband = deadband
+        self._write_stats = write_stats
+        self.record: EntityRecord | None = None  # Bound by RVCRegistry.add()
+
+        # Downsampled min/max/mean history for numeric (unit-bearing) fields
+        self.history: SensorHistory | None = SensorHistory() if unit else None
+
+        # Writes are coalesced by the shared scheduler
+        self._scheduler = scheduler
+        self.min_update_interval = min_update_interval
+
+        # Set by StalenessTracker when the source stops reporting
+        self.stale = False
+
     @property
     def native_value(self) -> StateType:
         """Return the current state."""
@@ -188,16 +490,91 @@ class RVCBridgeSensor(SensorEntity):
 
     @callback
     def async_update_state(self, value: Any) -> None:
-        """Update sensor state from MQTT message."""
+        """Update sensor state from MQTT message, skipping deadband jitter."""
+        if self.history is not None:
+            # Every sample feeds the trend buffers, including suppressed ones
+            self.history.add(time.time(), value)
+
+        record = self.record
+        now = time.monotonic()
+        if not self._deadband.should_write(
+            record.last_value, value, now - record.last_write
+        ):
+            record.suppressed += 1
+            self._write_stats["suppressed"] += 1
+            return
+
         self._current_state = value
-        self.async_write_ha_state()
+        record.last_value = value
+        record.last_write = now
+        self._write_stats["written"] += 1
+        self._scheduler.async_schedule(self)
+
+    @callback
+    def async_restore_state(self, value: Any) -> None:
+        """Show a snapshot value until the first live update (no write yet)."""
+        self._current_state = value
+        # Keep it in the next snapshot even if the source stays quiet
+        self.record.last_value = value
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Drop any pending write."""
+        self._scheduler.async_forget(self)
 
     @property
     def available(self) -> bool:
-        """Sensor is available if we have a state."""
-        return self._current_state is not None
+        """Sensor is available while its source is reporting.
+
+        Sensors are only created once they have a value, so a None state later
+        (e.g. time_to_empty_h while not discharging) shows as unknown.
+        """
+        return not self.stale
 
     @property
     def should_poll(self) -> bool:
         """No polling; updated via MQTT messages."""
         return False
+
+
+class RVCBridgeDiagnosticSensor(SensorEntity):
+    """Integration health counter (ingress, decode, state writes)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        entry_id: str,
+        entry_data: dict[str, Any],
+        key: str,
+        name: str,
+        icon: str,
+        unit: Optional[str],
+        state_class: SensorStateClass,
+        value_fn,
+    ):
+        """Initialize the diagnostic sensor."""
+        self._entry_data = entry_data
+        self._value_fn = value_fn
+        self._attr_unique_id = f"{entry_id}_diagnostic_{key}"
+        self._attr_name = f"RV-C Bridge {name}"
+        self._attr_icon = icon
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+        self._attributes_fn = DIAGNOSTIC_ATTRIBUTES.get(key)
+
+    def _read(self) -> None:
+        """Read the current value (and attributes) from the entry data."""
+        self._attr_native_value = self._value_fn(self._entry_data)
+        if self._attributes_fn is not None:
+            self._attr_extra_state_attributes = self._attributes_fn(self._entry_data)
+
+    async def async_update(self) -> None:
+        """Read the current counter value (initial add)."""
+        self._read()
+
+    @callback
+    def async_refresh(self) -> None:
+        """Read the current counter value and write state."""
+        self._read()
+        self.async_write_ha_state()
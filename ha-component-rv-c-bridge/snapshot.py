@@ -0,0 +1,89 @@
+"""Persistent last-known-state snapshot for RV-C Bridge entities.
+
+A compact copy of every discovered entity and its last value is kept in
+.storage so entities can be recreated with plausible states right after a
+restart, before the bridge republishes. Live MQTT data then overwrites them.
+
+Format:
+  {"sensors": [[category, instance, field, value], ...],
+   "thermostats": [[instance, hvac_mode, fan_mode, target, current], ...]}
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, SNAPSHOT_STORAGE_VERSION
+from .registry import RVCRegistry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RVCSnapshot:
+    """Debounced on-disk snapshot of the registry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, registry: RVCRegistry):
+        """Initialize the snapshot store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._registry = registry
+        self._dirty = False
+        self.restored: dict[str, Any] = {"sensors": [], "thermostats": []}
+
+    async def async_load(self) -> None:
+        """Load the last snapshot (if any) into self.restored."""
+        data = await self._store.async_load()
+        if data:
+            self.restored = data
+            _LOGGER.info(
+                "Restoring %d sensors and %d thermostats from snapshot",
+                len(data.get("sensors", [])),
+                len(data.get("thermostats", [])),
+            )
+
+    @callback
+    def async_mark_dirty(self) -> None:
+        """Note that values changed; schedules one save per delay window."""
+        if self._dirty:
+            return
+        # Only arm once: Store.async_delay_save re-arms on every call, which
+        # would starve the save under continuous traffic
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Build the snapshot from current registry state."""
+        self._dirty = False
+        sensors = []
+        thermostats = []
+        for record in self._registry:
+            category, instance, field = record.key
+            if category == "thermostat":
+                entity = record.entity
+                thermostats.append(
+                    [
+                        instance,
+                        entity.hvac_mode,
+                        entity.fan_mode,
+                        entity.target_temperature,
+                        entity.current_temperature,
+                    ]
+                )
+            elif record.last_value is not None:
+                sensors.append([category, instance, field, record.last_value])
+        return {"sensors": sensors, "thermostats": thermostats}
+
+    async def async_flush(self) -> None:
+        """Write a pending snapshot now (entry unload) instead of on a timer."""
+        if self._dirty:
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        """Delete the snapshot (config entry removed)."""
+        await self._store.async_remove()
@@ -0,0 +1,135 @@
+"""Staleness detection for RV-C Bridge entities.
+
+Ingress records when each (category, instance) was last heard from, using the
+payload timestamp when it agrees with HA's clock. One periodic sweep over the
+registry marks entities whose source has gone quiet for longer than the
+category timeout as unavailable, so the number of event-loop timers does not
+grow with the number of entities. A fresh message revives them immediately.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CATEGORY_STALE_TIMEOUTS,
+    CLOCK_SKEW_TOLERANCE,
+    STALE_CATEGORY_ALIASES,
+    STALE_SWEEP_INTERVAL,
+)
+from .registry import EntityRecord, RVCRegistry
+from .scheduler import StateWriteScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+SourceKey = tuple[str, str]  # (category, instance)
+
+
+class StalenessTracker:
+    """Last-seen times per source plus a shared sweep over the registry."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        registry: RVCRegistry,
+        scheduler: StateWriteScheduler,
+        default_timeout: float,
+    ):
+        """Initialize the tracker."""
+        self._hass = hass
+        self._registry = registry
+        self._scheduler = scheduler
+        self._default_timeout = default_timeout
+        self._seen: dict[SourceKey, float] = {}
+        self._stale: dict[SourceKey, list[EntityRecord]] = {}
+        # Entities restored from the snapshot count as seen at startup
+        self._started = time.time()
+        self._unsub: Optional[Callable[[], None]] = None
+
+    def timeout(self, category: str) -> Optional[float]:
+        """Return the staleness timeout (seconds) for a registry category.
+
+        None means the category only publishes on change and never goes stale.
+        """
+        return CATEGORY_STALE_TIMEOUTS.get(category, self._default_timeout)
+
+    @callback
+    def async_mark_seen(
+        self, category: str, instance: str, stamp: Optional[float]
+    ) -> None:
+        """Record a message from a source; revive its entities if stale."""
+        now = time.time()
+        # Trust the bridge's clock only when it roughly agrees with ours
+        if stamp is not None and now - CLOCK_SKEW_TOLERANCE <= stamp <= now:
+            now = stamp
+        key = (category, instance)
+        self._seen[key] = now
+        if key in self._stale:
+            self._async_revive(key)
+
+        alias = STALE_CATEGORY_ALIASES.get(category)
+        if alias is not None:
+            key = (alias, instance)
+            self._seen[key] = now
+            if key in self._stale:
+                self._async_revive(key)
+
+    @callback
+    def _async_revive(self, key: SourceKey) -> None:
+        """Mark a source's stale entities available again."""
+        for record in self._stale.pop(key):
+            record.entity.stale = False
+            self._scheduler.async_schedule(record.entity)
+        _LOGGER.debug("%s %s is reporting again", *key)
+
+    @callback
+    def async_start(self) -> None:
+        """Start the periodic sweep."""
+        self._unsub = async_track_time_interval(
+            self._hass, self._async_sweep, timedelta(seconds=STALE_SWEEP_INTERVAL)
+        )
+
+    @callback
+    def _async_sweep(self, _now: Optional[datetime] = None) -> None:
+        """Mark entities whose source has timed out as unavailable."""
+        now = time.time()
+        newly_stale = 0
+        for record in self._registry:
+            entity = record.entity
+            if entity.stale:
+                continue
+            category, instance, _ = record.key
+            timeout = self.timeout(category)
+            if timeout is None:
+                continue
+            key = (category, instance)
+            if now - self._seen.get(key, self._started) <= timeout:
+                continue
+            entity.stale = True
+            self._stale.setdefault(key, []).append(record)
+            self._scheduler.async_schedule(entity)
+            newly_stale += 1
+        if newly_stale:
+            _LOGGER.info(
+                "Marked %d RV-C entities unavailable (no data from %d sources)",
+                newly_stale,
+                len(self._stale),
+            )
+
+    @property
+    def stale_sources(self) -> list[str]:
+        """Return "category/instance" for every source currently stale."""
+        return [f"{category}/{instance}" for category, instance in self._stale]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the sweep."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
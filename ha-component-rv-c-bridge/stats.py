@@ -0,0 +1,188 @@
+"""Low-overhead ingress counters and timing histograms.
+
+Counters are plain ints and histograms are fixed bucket arrays, so recording
+costs a few integer operations per message. Snapshots are built on demand for
+the diagnostic sensors and config-entry diagnostics.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Optional
+
+from .const import (
+    CLOCK_SKEW_NEGATIVE_TOLERANCE,
+    CLOCK_SKEW_TOLERANCE,
+    LATENCY_WINDOW_SIZE,
+)
+
+# Histogram bucket upper bounds in microseconds; a final bucket catches the rest
+HISTOGRAM_BUCKETS_US = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 10000)
+
+# Buckets for slow round trips (thermostat command -> status echo)
+COMMAND_LATENCY_BUCKETS_US = (
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    2_000_000,
+    5_000_000,
+    10_000_000,
+)
+
+
+def _bucket_label(us: int) -> str:
+    """Human-readable bucket bound."""
+    if us >= 1_000_000:
+        return f"{us / 1_000_000:g}s"
+    if us >= 1000:
+        return f"{us / 1000:g}ms"
+    return f"{us}us"
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (nanosecond samples)."""
+
+    __slots__ = ("buckets_us", "bounds_ns", "counts", "count", "total_ns", "max_ns")
+
+    def __init__(self, buckets_us: tuple[int, ...] = HISTOGRAM_BUCKETS_US):
+        """Initialize empty buckets."""
+        self.buckets_us = buckets_us
+        self.bounds_ns = tuple(us * 1000 for us in buckets_us)
+        self.counts = [0] * (len(buckets_us) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, ns: int) -> None:
+        """Record one sample."""
+        self.counts[bisect_left(self.bounds_ns, ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @property
+    def mean_us(self) -> float:
+        """Mean sample in microseconds."""
+        return self.total_ns / self.count / 1000 if self.count else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot."""
+        labels = [f"<={_bucket_label(us)}" for us in self.buckets_us] + [
+            f">{_bucket_label(self.buckets_us[-1])}"
+        ]
+        return {
+            "count": self.count,
+            "mean_us": round(self.mean_us, 2),
+            "max_us": round(self.max_ns / 1000, 2),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class LatencyWindow:
+    """Rolling window of bridge -> HA delivery latencies (seconds).
+
+    Samples outside [-CLOCK_SKEW_NEGATIVE_TOLERANCE, CLOCK_SKEW_TOLERANCE]
+    can't be real delivery delays, so they are counted as clock skew instead
+    of polluting the percentiles.
+    """
+
+    __slots__ = ("samples", "head", "filled", "count", "skewed", "clock_skew", "last_offset")
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE):
+        """Initialize an empty window."""
+        self.samples = array("d", [0.0]) * size
+        self.head = 0
+        self.filled = 0
+        self.count = 0
+        self.skewed = 0
+        self.clock_skew = False  # Most recent sample looked skewed
+        self.last_offset: Optional[float] = None  # Its apparent offset (s)
+
+    def observe(self, latency: float) -> None:
+        """Record one sample."""
+        self.count += 1
+        if not -CLOCK_SKEW_NEGATIVE_TOLERANCE <= latency <= CLOCK_SKEW_TOLERANCE:
+            self.skewed += 1
+            self.clock_skew = True
+            self.last_offset = latency
+            return
+        self.clock_skew = False
+        samples = self.samples
+        samples[self.head] = latency if latency > 0 else 0.0
+        self.head = (self.head + 1) % len(samples)
+        if self.filled < len(samples):
+            self.filled += 1
+
+    def percentiles_ms(self, pcts: tuple[int, ...] = (50, 90, 99)) -> dict[str, float]:
+        """Return {"p50_ms": ..., "max_ms": ...} over the window (one sort)."""
+        if not self.filled:
+            return {}
+        ordered = sorted(self.samples[: self.filled])
+        last = self.filled - 1
+        result = {
+            f"p{pct}_ms": round(ordered[min(last, pct * self.filled // 100)] * 1000, 1)
+            for pct in pcts
+        }
+        result["max_ms"] = round(ordered[last] * 1000, 1)
+        return result
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot."""
+        result: dict[str, Any] = {"count": self.count, "skewed": self.skewed}
+        result.update(self.percentiles_ms())
+        result["clock_skew"] = self.clock_skew
+        if self.last_offset is not None:
+            result["last_skew_s"] = round(self.last_offset, 1)
+        return result
+
+
+class CategoryStats:
+    """Per-category message count, decode/handler time and bridge latency."""
+
+    __slots__ = ("messages", "decode", "handler", "latency")
+
+    def __init__(self):
+        """Initialize counters."""
+        self.messages = 0
+        self.decode = Histogram()
+        self.handler = Histogram()
+        self.latency = LatencyWindow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot."""
+        return {
+            "messages": self.messages,
+            "decode": self.decode.as_dict(),
+            "handler": self.handler.as_dict(),
+            "latency": self.latency.as_dict(),
+        }
+
+
+class IngressStats:
+    """Counters for everything arriving through RVCIngress."""
+
+    __slots__ = ("received", "decoded", "dropped_unmapped", "dropped_bad_payload", "categories")
+
+    def __init__(self):
+        """Initialize counters."""
+        self.received = 0
+        self.decoded = 0
+        self.dropped_unmapped = 0
+        self.dropped_bad_payload = 0
+        self.categories: dict[str, CategoryStats] = {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot."""
+        return {
+            "received": self.received,
+            "decoded": self.decoded,
+            "dropped_unmapped": self.dropped_unmapped,
+            "dropped_bad_payload": self.dropped_bad_payload,
+            "categories": {
+                category: stats.as_dict()
+                for category, stats in self.categories.items()
+            },
+        }
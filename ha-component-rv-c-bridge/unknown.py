@@ -0,0 +1,96 @@
+"""Bounded aggregator for unmapped rvcbridge categories.
+
+Records a count, first/last seen time and the most recent payload sample per
+(category, instance). Memory is fixed: at most UNKNOWN_MAX_ENTRIES keys, each
+with a truncated raw sample, with least-recently-seen keys evicted first.
+Payloads are stored raw and only decoded when a snapshot is requested.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import UNKNOWN_MAX_ENTRIES, UNKNOWN_SAMPLE_BYTES
+
+
+class UnknownEntry:
+    """Aggregate for one unmapped (category, instance)."""
+
+    __slots__ = ("count", "first_seen", "last_seen", "sample")
+
+    def __init__(self, now: float):
+        """Initialize the entry."""
+        self.count = 0
+        self.first_seen = now
+        self.last_seen = now
+        self.sample = b""
+
+
+class UnknownAggregator:
+    """LRU-bounded map of (category, instance) -> UnknownEntry."""
+
+    def __init__(
+        self,
+        max_entries: int = UNKNOWN_MAX_ENTRIES,
+        sample_bytes: int = UNKNOWN_SAMPLE_BYTES,
+    ):
+        """Initialize the aggregator."""
+        self._entries: OrderedDict[tuple[str, str], UnknownEntry] = OrderedDict()
+        self._max_entries = max_entries
+        self._sample_bytes = sample_bytes
+        self.evicted = 0
+
+    def record(self, category: str, instance: str, payload: bytes | str) -> None:
+        """Count one unmapped message."""
+        key = (category, instance)
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None:
+            if len(self._entries) >= self._max_entries:
+                self._entries.popitem(last=False)
+                self.evicted += 1
+            entry = self._entries[key] = UnknownEntry(now)
+        else:
+            self._entries.move_to_end(key)
+        entry.count += 1
+        entry.last_seen = now
+        entry.sample = payload[: self._sample_bytes]
+
+    def clear(self) -> None:
+        """Forget everything recorded so far."""
+        self._entries.clear()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._entries)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a JSON-friendly snapshot, most frequent first."""
+
+        def _iso(ts: float) -> str:
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+        entries = sorted(
+            self._entries.items(), key=lambda item: item[1].count, reverse=True
+        )
+        return {
+            "tracked": len(entries),
+            "evicted": self.evicted,
+            "unknown": [
+                {
+                    "category": category,
+                    "instance": instance,
+                    "count": entry.count,
+                    "first_seen": _iso(entry.first_seen),
+                    "last_seen": _iso(entry.last_seen),
+                    "sample": entry.sample.decode("utf-8", errors="replace")
+                    if isinstance(entry.sample, bytes)
+                    else entry.sample,
+                }
+                for (category, instance), entry in entries
+            ],
+        }
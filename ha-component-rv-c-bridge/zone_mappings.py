@@ -7,8 +7,27 @@ Maps instance numbers to human-readable zone names.
 Instance mapping (by PGN type):
 - Zone temperature (actual sensors): instances 0-5, 19
 - Thermostat setpoints: instances 0-6
+
+These are the built-in (Entegra Aspire) defaults. Other coaches override them
+with a YAML profile and/or the zone_map option; ZoneMap compiles the layers
+once per config entry into per-context lookup tables keyed by the instance
+string as it appears in the MQTT topic.
+
+Profile format (YAML, path relative to the HA config dir):
+  temperature:
+    0: front
+    19: outdoor
+  thermostat:
+    0: front
+    5: bay
 """
 
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import yaml
+
 # Zone instance → friendly name
 # These are constants that can be shared across decoders
 ZONE_NAMES = {
@@ -33,6 +52,87 @@ THERMOSTAT_ZONES = {
     6: "floor",
 }
 
+# Sensor categories whose instances are zones, and which map they use
+CATEGORY_ZONE_CONTEXTS = {
+    "zone_temperature": "temperature",
+    "thermostat_setpoint": "thermostat",
+    "thermostat_status": "thermostat",
+}
+
+ZONE_CONTEXTS = ("temperature", "thermostat")
+
+
+class ZoneMap:
+    """Compiled instance -> zone name tables, one per context."""
+
+    __slots__ = ("_names", "_instances")
+
+    def __init__(self, *layers: dict[str, dict[Any, str]]):
+        """Merge layers (later wins) into str-keyed tables per context."""
+        self._names: dict[str, dict[str, str]] = {
+            context: {} for context in ZONE_CONTEXTS
+        }
+        for layer in layers:
+            for context, mapping in (layer or {}).items():
+                if context not in self._names:
+                    raise ValueError(f"Unknown zone context: {context}")
+                for instance, name in mapping.items():
+                    self._names[context][str(int(instance))] = str(name)
+        # Reverse tables for resolving zone names in service calls
+        self._instances = {
+            context: {name: instance for instance, name in names.items()}
+            for context, names in self._names.items()
+        }
+
+    def lookup(self, instance: str, context: str) -> Optional[str]:
+        """Return the zone name for an instance, or None if unmapped."""
+        return self._names[context].get(instance)
+
+    def name(self, instance: str, context: str) -> str:
+        """Return the zone name for an instance, or zone_<instance>."""
+        return self._names[context].get(instance) or f"zone_{instance}"
+
+    def instance(self, zone: str, context: str) -> Optional[str]:
+        """Return the instance for a zone name (or instance string)."""
+        if zone in self._instances[context]:
+            return self._instances[context][zone]
+        return zone if zone.isdigit() else None
+
+    def instances(self, context: str) -> list[str]:
+        """Return every mapped instance for a context."""
+        return list(self._names[context])
+
+    def as_dict(self) -> dict[str, dict[str, str]]:
+        """Return the compiled tables (diagnostics)."""
+        return {context: dict(names) for context, names in self._names.items()}
+
+
+def compile_zone_map(
+    profile: Optional[dict[str, dict[Any, str]]] = None,
+    overrides: Optional[dict[str, dict[Any, str]]] = None,
+) -> ZoneMap:
+    """Compile built-in defaults, then a profile, then per-entry overrides."""
+    return ZoneMap(
+        {"temperature": ZONE_NAMES, "thermostat": THERMOSTAT_ZONES},
+        profile,
+        overrides,
+    )
+
+
+def load_zone_profile(path: str) -> dict[str, dict[Any, str]]:
+    """Read a YAML zone profile. Raises OSError/ValueError on bad files."""
+    with open(path, encoding="utf-8") as profile:
+        try:
+            data = yaml.safe_load(profile) or {}
+        except yaml.YAMLError as err:
+            raise ValueError(f"Invalid zone profile {path}: {err}") from err
+    if not isinstance(data, dict) or not all(
+        isinstance(mapping, dict) for mapping in data.values()
+    ):
+        raise ValueError(f"Zone profile {path} must map contexts to instances")
+    return data
+
+
 def get_zone_name(instance, context="temperature"):
     """Get friendly name for an instance number.
     
@@ -10,17 +10,68 @@ Watches the rvc_decoder output for:
 Outputs to: pgn-discovery.jsonl (append mode)
 Format: {"pgn": "0x1FXXX", "source": X, "data": "...", "timestamp": ..., "status": "unknown|error|new_instance"}
 
+With --follow the monitor keeps running and tails the decoder log like
+`tail -F`: new lines are picked up via inotify (polling on other platforms),
+and logrotate renames/copytruncate are detected and followed.
+
+Records are written through one long-lived, buffered output file. Buffers are
+flushed at --flush-bytes, once the oldest has waited --flush-interval seconds
+(also checked whenever the input goes idle), and on exit. With
+--fsync-interval written data is also fsync'ed that often, so a power cut
+loses at most that much.
+
+Progress is checkpointed (input file identity, byte offset, known PGNs and
+instances) to OUTPUT.checkpoint every few seconds and on exit, so a restart
+resumes where it stopped and only emits records that are new.
+
+--batch scans a glob of archived logs (oldest first by mtime) instead: plain
+files are split into newline-aligned ranges, ranges and .gz files are
+scanned on a process pool, and the per-chunk results are merged in input
+order so the output is identical to a sequential scan (--jobs 1). Batch runs
+don't use the checkpoint.
+
+--summary replaces the per-frame error_or_unknown lines with an aggregate per
+(pgn, source): count, first/last timestamp, rate, number of distinct payloads
+and a few sample payloads, rewritten every --summary-interval seconds.
+new_instance records still go to the output.
+
 Usage:
   python3 pgn-discovery-monitor.py [--log-file /path/to/rvc.jsonl] [--output pgn-discovery.jsonl]
-  
+  python3 pgn-discovery-monitor.py --follow --fsync-interval 30
+
+  # Mine rotated archives (plain and .gz) on all cores
+  python3 pgn-discovery-monitor.py --batch '/var/log/rvc_decoder.jsonl*' --output archive.jsonl
+
+  # Keep unknown PGNs as a compact per-(pgn, source) summary, refreshed every minute
+  python3 pgn-discovery-monitor.py --follow --summary pgn-summary.json
+
+  # Start over instead of resuming from pgn-discovery.jsonl.checkpoint
+  python3 pgn-discovery-monitor.py --rescan
+
+  # Output throughput: buffered sink vs. open/append/close per record
+  python3 pgn-discovery-monitor.py --benchmark 100000
+
   # Tail the live output:
   tail -f pgn-discovery.jsonl | jq .
 """
 
+import concurrent.futures
+import ctypes
+import ctypes.util
+import glob
+import gzip
 import json
 import logging
 import argparse
+import functools
+import os
+import select
+import signal
+import struct
 import sys
+import tempfile
+import time
+import zlib
 from datetime import datetime, timezone
 from collections import defaultdict
 
@@ -30,6 +81,831 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+# Follow mode: bytes per read, and the longest we sleep without re-checking
+# the file (a safety net for missed inotify events; idle cost is one stat/s)
+READ_SIZE = 64 * 1024
+IDLE_TIMEOUT = 1.0
+
+# Output sink defaults: flush when this many bytes are buffered, or when the
+# oldest buffered record is this many seconds old
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 1.0
+
+# Checkpoint format version, and how much of the input's head is hashed to
+# tell a rewritten file from the checkpointed one
+CHECKPOINT_VERSION = 1
+CHECKPOINT_INTERVAL = 10.0
+FINGERPRINT_BYTES = 4096
+
+# Summary mode: distinct payload values kept as samples per (pgn, source),
+# and distinct payloads counted exactly up to this many
+SUMMARY_SAMPLES = 8
+SUMMARY_DISTINCT_LIMIT = 1024
+
+# Batch mode: plain files are split into ranges of about this many bytes
+BATCH_CHUNK_BYTES = 32 * 1024 * 1024
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then the name
+
+
+class InotifyWaiter:
+    """Sleep until the log file changes (Linux only).
+
+    The watch is on the directory, but events for other names in it (our own
+    output and checkpoint, other logs) are ignored rather than waking us.
+    """
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory, not the file, so renames and re-creates are seen
+        directory = os.path.dirname(os.path.abspath(path))
+        self._name = os.fsencode(os.path.basename(path))
+        mask = IN_MODIFY | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if libc.inotify_add_watch(self._fd, os.fsencode(directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout):
+        """Block until the log file changes or timeout passes."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable or self._drain():
+                return
+
+    def _drain(self):
+        """Read all queued events; return True if any concerns the log file."""
+        relevant = False
+        try:
+            while True:
+                events = os.read(self._fd, 4096)
+                if not events:
+                    break
+                position = 0
+                while position < len(events):
+                    _, mask, _, length = INOTIFY_EVENT.unpack_from(events, position)
+                    position += INOTIFY_EVENT.size
+                    name = events[position : position + length].rstrip(b"\0")
+                    position += length
+                    if name == self._name or mask & IN_Q_OVERFLOW:
+                        relevant = True
+        except BlockingIOError:
+            pass
+        return relevant
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollWaiter:
+    """Fallback when inotify is unavailable: sleep for a fixed interval."""
+
+    def __init__(self, interval):
+        self._interval = interval
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self._interval))
+
+    def close(self):
+        pass
+
+
+def make_waiter(path, poll_interval):
+    """Prefer inotify; fall back to polling."""
+    try:
+        return InotifyWaiter(path)
+    except (OSError, AttributeError, TypeError) as e:
+        log.info(f"inotify unavailable ({e}); polling every {poll_interval}s")
+        return PollWaiter(poll_interval)
+
+
+class LogTailer:
+    """Yield complete lines from a growing file, surviving rotation.
+
+    At EOF the path is re-stat'ed: a different inode means the file was
+    renamed away (logrotate create mode) and the new file is opened from the
+    start once the old one is drained (the old file keeps being read while
+    the path is missing); a size below our offset means it was truncated in
+    place (copytruncate) and reading restarts at 0.
+
+    offset is the byte position just past the last line yielded, so it can
+    be checkpointed once that line is processed and resumed from.
+    """
+
+    def __init__(self, path, waiter=None, on_idle=None, resume=None):
+        self.path = path
+        self._waiter = waiter
+        self._on_idle = on_idle  # Called before blocking (e.g. flush output)
+        self._resume = resume  # Checkpointed {"inode", "offset", ...} or None
+        self._file = None
+        self._inode = None
+        self._buffer = b""
+        self.offset = 0
+
+    def _open(self):
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        stat = os.fstat(self._file.fileno())
+        self._inode = stat.st_ino
+        self._buffer = b""
+        self.offset = 0
+
+        # Resume only into the same file, and only if it wasn't rewritten
+        resume, self._resume = self._resume, None
+        if resume is not None:
+            offset = resume["offset"]
+            if (
+                resume["inode"] == stat.st_ino
+                and resume["device"] == stat.st_dev
+                and offset <= stat.st_size
+                and self.fingerprint(resume["fingerprint_bytes"])
+                == resume["fingerprint"]
+            ):
+                self._file.seek(offset)
+                self.offset = offset
+                log.info(f"Resuming {self.path} at byte {offset:,}")
+            else:
+                log.info(f"{self.path} changed since the checkpoint; reading it all")
+        return True
+
+    def _close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def fingerprint(self, length):
+        """CRC32 of the first length bytes (detects a re-used inode)."""
+        return zlib.crc32(os.pread(self._file.fileno(), length, 0))
+
+    def identity(self):
+        """Return a resumable position for the checkpoint, or None."""
+        if self._file is None:
+            return None
+        stat = os.fstat(self._file.fileno())
+        length = min(FINGERPRINT_BYTES, self.offset)
+        return {
+            "device": stat.st_dev,
+            "inode": stat.st_ino,
+            "offset": self.offset,
+            "fingerprint_bytes": length,
+            "fingerprint": self.fingerprint(length),
+        }
+
+    def lines(self, follow=True):
+        """Generate complete lines (bytes, without newline).
+
+        Without follow, stop at EOF after yielding any final line that lacks
+        a newline (see _final_line()).
+        """
+        announced_missing = False
+        while True:
+            if self._file is None and not self._open():
+                if not follow:
+                    raise FileNotFoundError(self.path)
+                if not announced_missing:
+                    log.info(f"Waiting for {self.path} to appear")
+                    announced_missing = True
+                self._waiter.wait(IDLE_TIMEOUT)
+                continue
+            announced_missing = False
+
+            chunk = self._file.read(READ_SIZE)
+            if chunk:
+                self._buffer += chunk
+                *complete, self._buffer = self._buffer.split(b"\n")
+                for line in complete:
+                    # Advance first: a checkpoint taken while the consumer
+                    # handles this line must not replay it on restart
+                    self.offset += len(line) + 1
+                    yield line
+                continue
+            if not follow:
+                if self._buffer:
+                    yield from self._final_line()
+                return
+
+            # At EOF: has the file been rotated or truncated?
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                # Renamed away and not yet re-created: the writer may still be
+                # appending to the old file, so keep reading it until it is
+                self._waiter.wait(IDLE_TIMEOUT)
+                continue
+            if stat.st_ino != self._inode:
+                if self._buffer:
+                    yield self._buffer  # Final line without a newline
+                log.info(f"{self.path} was rotated; reopening")
+                self._close()
+                continue
+            if stat.st_size < self._file.tell():
+                log.info(f"{self.path} was truncated; reading from the start")
+                self._file.seek(0)
+                self._buffer = b""
+                self.offset = 0
+                continue
+            if self._on_idle is not None:
+                self._on_idle()
+            self._waiter.wait(IDLE_TIMEOUT)
+
+    def _final_line(self):
+        """Yield a last line without a newline (one-shot mode at EOF).
+
+        It is always passed on, like a plain `for line in file` would, but
+        the offset only moves past it if it is complete JSON; a line the
+        decoder is still writing is picked up whole on the next run.
+        """
+        line, self._buffer = self._buffer, b""
+        try:
+            json.loads(line)
+        except ValueError:
+            pass
+        else:
+            self.offset += len(line)
+        yield line
+
+    def close(self):
+        self._close()
+        if self._waiter is not None:
+            self._waiter.close()
+
+
+class Checkpoint:
+    """Persisted input position and known PGN/instance sets.
+
+    Written atomically after the output has been flushed, so a crash can at
+    worst repeat the records since the last checkpoint, never lose them.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self, log_file):
+        """Return (position or None, known_pgns, known_instances, summary)."""
+        known_pgns = set()
+        known_instances = defaultdict(set)
+        try:
+            with open(self.path, encoding="utf-8") as infile:
+                state = json.load(infile)
+        except FileNotFoundError:
+            return None, known_pgns, known_instances, None
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None, known_pgns, known_instances, None
+        if state.get("version") != CHECKPOINT_VERSION:
+            log.warning(f"Ignoring checkpoint {self.path} (version mismatch)")
+            return None, known_pgns, known_instances, None
+
+        known_pgns.update(state["known_pgns"])
+        for pgn, instances in state["known_instances"].items():
+            known_instances[pgn].update(instances)
+        # Known sets carry over to any input; the offset only to the same file
+        position = state["position"] if state["log_file"] == log_file else None
+        log.info(
+            f"Loaded checkpoint: {len(known_pgns)} PGNs, "
+            f"{sum(len(v) for v in known_instances.values())} instances"
+        )
+        return position, known_pgns, known_instances, state.get("summary")
+
+    def save(self, log_file, position, known_pgns, known_instances, summary=None):
+        """Write the checkpoint via a temp file + rename."""
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "log_file": log_file,
+            "position": position,
+            "known_pgns": sorted(known_pgns),
+            "known_instances": {
+                pgn: list(instances) for pgn, instances in known_instances.items()
+            },
+            "summary": summary,  # SummarySink.state() in --summary mode
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outfile:
+            json.dump(state, outfile, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+
+class OutputSink:
+    """Long-lived append-only JSONL writer with size/time batching."""
+
+    def __init__(
+        self,
+        path,
+        flush_bytes=FLUSH_BYTES,
+        flush_interval=FLUSH_INTERVAL,
+        fsync_interval=0.0,
+    ):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._flush_bytes = flush_bytes
+        self._flush_interval = flush_interval
+        self._fsync_interval = fsync_interval  # 0 = leave it to the OS
+        self._pending = []
+        self._pending_bytes = 0
+        self._first_pending = 0.0
+        self._last_fsync = time.monotonic()
+        self._unsynced = False  # Written since the last fsync
+        self.records = 0
+
+    def write(self, discovery_record):
+        """Buffer one record; flush if a threshold is reached."""
+        line = json.dumps(discovery_record) + "\n"
+        if not self._pending:
+            self._first_pending = time.monotonic()
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        self.records += 1
+        if (
+            self._pending_bytes >= self._flush_bytes
+            or time.monotonic() - self._first_pending >= self._flush_interval
+        ):
+            self.flush()
+
+    def flush_if_due(self):
+        """Flush only once the oldest pending record is flush_interval old.
+
+        --follow calls this each time it catches up with the log, which on a
+        live log is after nearly every decoder write; flushing there
+        unconditionally would defeat the batching.
+        """
+        if (
+            self._pending
+            and time.monotonic() - self._first_pending >= self._flush_interval
+        ):
+            self.flush()
+        else:
+            # Data flushed just before the input went quiet still gets synced
+            self._fsync_if_due()
+
+    def flush(self):
+        """Write buffered records (and fsync if one is due)."""
+        if self._pending:
+            self._file.write("".join(self._pending))
+            self._pending.clear()
+            self._pending_bytes = 0
+            self._file.flush()
+            self._unsynced = True
+        self._fsync_if_due()
+
+    def _fsync_if_due(self):
+        if not (self._fsync_interval and self._unsynced):
+            return
+        now = time.monotonic()
+        if now - self._last_fsync >= self._fsync_interval:
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self._unsynced = False
+
+    def close(self):
+        """Flush, fsync (if enabled) and close."""
+        self.flush()
+        if self._fsync_interval and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def _payload_digest(data):
+    return zlib.crc32(str(data).encode())
+
+
+class PgnSummary:
+    """Running aggregate of undecoded frames for one (pgn, source)."""
+
+    __slots__ = ("count", "first_ts", "last_ts", "hashes", "extra", "samples")
+
+    def __init__(self, timestamp):
+        self.count = 0
+        self.first_ts = timestamp
+        self.last_ts = timestamp
+        self.hashes = set()  # CRC32 of distinct payloads, up to SUMMARY_DISTINCT_LIMIT
+        self.extra = 0  # Distinct payloads restored without their hashes
+        self.samples = []  # First SUMMARY_SAMPLES distinct payloads
+
+    @property
+    def distinct(self):
+        return len(self.hashes) + self.extra
+
+    def add(self, data, timestamp):
+        self.count += 1
+        self.last_ts = timestamp
+        if self.distinct < SUMMARY_DISTINCT_LIMIT:
+            digest = _payload_digest(data)
+            if digest not in self.hashes:
+                self.hashes.add(digest)
+                if len(self.samples) < SUMMARY_SAMPLES:
+                    self.samples.append(data)
+
+    def merge(self, later):
+        """Fold in the aggregate of a later stretch of input (batch chunks)."""
+        self.count += later.count
+        self.last_ts = later.last_ts
+        for sample in later.samples:
+            if len(self.samples) >= SUMMARY_SAMPLES:
+                break
+            if _payload_digest(sample) not in self.hashes:
+                self.samples.append(sample)
+        for digest in later.hashes:
+            if self.distinct >= SUMMARY_DISTINCT_LIMIT:
+                break
+            self.hashes.add(digest)
+
+    def to_state(self, full):
+        """Checkpoint entry; the hash set only when full."""
+        return [
+            self.count,
+            self.first_ts,
+            self.last_ts,
+            self.distinct,
+            self.samples,
+            list(self.hashes) if full else None,
+        ]
+
+    @classmethod
+    def from_state(cls, state):
+        count, first_ts, last_ts, distinct, samples, hashes = state
+        summary = cls(first_ts)
+        summary.count = count
+        summary.last_ts = last_ts
+        summary.samples = samples
+        if hashes is not None:
+            summary.hashes = set(hashes)
+        else:
+            # Samples are the first distinct payloads, so below
+            # SUMMARY_SAMPLES distinct values this is still exact
+            summary.hashes = {_payload_digest(sample) for sample in samples}
+            summary.extra = distinct - len(summary.hashes)
+        return summary
+
+    def as_dict(self):
+        """Compact snapshot entry."""
+        rate = None
+        if isinstance(self.first_ts, (int, float)) and isinstance(
+            self.last_ts, (int, float)
+        ):
+            span = self.last_ts - self.first_ts
+            if span > 0:
+                rate = round(self.count / span, 3)
+        return {
+            "count": self.count,
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "rate_hz": rate,
+            "distinct_payloads": self.distinct,
+            "distinct_capped": self.distinct >= SUMMARY_DISTINCT_LIMIT,
+            "samples": self.samples,
+        }
+
+
+def summarize_record(keys, discovery_record):
+    """Add an error_or_unknown record to keys; return True for a new key."""
+    key = (discovery_record["pgn"], discovery_record["source"])
+    summary = keys.get(key)
+    is_new = summary is None
+    if is_new:
+        summary = keys[key] = PgnSummary(discovery_record["timestamp"])
+    summary.add(discovery_record["data"], discovery_record["timestamp"])
+    return is_new
+
+
+class SummarySink:
+    """Aggregate error_or_unknown records by (pgn, source) instead of
+    writing one line per frame; other records pass through to the sink.
+
+    The aggregate is written to its own JSON file (atomically) every
+    interval seconds and on close. It also travels in the checkpoint so
+    restarts keep counting; periodic checkpoints leave out the distinct-
+    payload hashes (only the final one has them), so after a crash the
+    distinct counts of keys with more than SUMMARY_SAMPLES payloads may
+    count a payload seen before the restart once more.
+    """
+
+    def __init__(self, sink, path, interval, state=None):
+        self._sink = sink
+        self.path = path
+        self._interval = interval
+        self._next_snapshot = time.monotonic() + interval
+        self._keys = {}  # (pgn, source) -> PgnSummary
+        for pgn, source, *summary_state in state or ():
+            self._keys[(pgn, source)] = PgnSummary.from_state(summary_state)
+
+    @property
+    def records(self):
+        return self._sink.records
+
+    def write(self, discovery_record):
+        if discovery_record["status"] != "error_or_unknown":
+            self._sink.write(discovery_record)
+            return
+        if summarize_record(self._keys, discovery_record):
+            log.warning(
+                f"Unknown/Error PGN: {discovery_record['pgn']} "
+                f"from source {discovery_record['source']}"
+            )
+        if time.monotonic() >= self._next_snapshot:
+            self.snapshot()
+
+    def merge(self, keys):
+        """Fold in a batch chunk's aggregate (chunks arrive in input order)."""
+        for key, chunk_summary in keys.items():
+            summary = self._keys.get(key)
+            if summary is None:
+                self._keys[key] = chunk_summary
+                log.warning(f"Unknown/Error PGN: {key[0]} from source {key[1]}")
+            else:
+                summary.merge(chunk_summary)
+        if time.monotonic() >= self._next_snapshot:
+            self.snapshot()
+
+    def flush_if_due(self):
+        self._sink.flush_if_due()
+        if time.monotonic() >= self._next_snapshot:
+            self.snapshot()
+
+    def flush(self):
+        self._sink.flush()
+        if time.monotonic() >= self._next_snapshot:
+            self.snapshot()
+
+    def snapshot(self):
+        """Write the current aggregate, busiest keys first."""
+        self._next_snapshot = time.monotonic() + self._interval
+        keys = sorted(self._keys.items(), key=lambda item: -item[1].count)
+        snapshot = {
+            "generated": datetime.now(timezone.utc).isoformat(),
+            "keys": len(keys),
+            "frames": sum(summary.count for _, summary in keys),
+            "summary": [
+                {"pgn": pgn, "source": source, **summary.as_dict()}
+                for (pgn, source), summary in keys
+            ],
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as outfile:
+            json.dump(snapshot, outfile, indent=1)
+        os.replace(tmp_path, self.path)
+
+    def state(self, full=False):
+        """Aggregate for the checkpoint (with the hash sets only if full)."""
+        return [
+            [pgn, source, *summary.to_state(full)]
+            for (pgn, source), summary in self._keys.items()
+        ]
+
+    def close(self):
+        self.snapshot()
+        self._sink.close()
+
+
+def append_record(output, discovery_record):
+    """Open, append one record and close (the pre-sink behaviour; benchmark)."""
+    with open(output, "a") as outfile:
+        outfile.write(json.dumps(discovery_record) + "\n")
+
+
+def run_benchmark(count):
+    """Compare output throughput of OutputSink against append_record()."""
+    discovery_record = {
+        "pgn": "0x1FF9C",
+        "source": 129,
+        "data": "01FA7D0000FFFFFF",
+        "timestamp": 1771696303.541,
+        "status": "error_or_unknown",
+    }
+    with tempfile.TemporaryDirectory(prefix="pgn-bench-") as directory:
+        results = []
+
+        path = os.path.join(directory, "append.jsonl")
+        start = time.perf_counter()
+        for _ in range(count):
+            append_record(path, discovery_record)
+        results.append(("open/append/close", time.perf_counter() - start))
+
+        for label, fsync_interval in (("buffered sink", 0.0), ("buffered + fsync 1s", 1.0)):
+            path = os.path.join(directory, f"sink-{fsync_interval}.jsonl")
+            start = time.perf_counter()
+            sink = OutputSink(path, fsync_interval=fsync_interval)
+            for _ in range(count):
+                sink.write(discovery_record)
+            sink.close()
+            results.append((label, time.perf_counter() - start))
+
+    baseline = results[0][1]
+    for label, elapsed in results:
+        print(
+            f"{label:22s} {count / elapsed:12,.0f} records/s "
+            f"({baseline / elapsed:5.1f}x)"
+        )
+
+
+def process_line(line, known_pgns, known_instances, sink, verbose=True):
+    """Check one decoder log line and write any discovery record."""
+    try:
+        record = json.loads(line)
+    except ValueError:  # Bad JSON or bad UTF-8
+        return
+    if not isinstance(record, dict):
+        return
+
+    pgn = record.get("pgn")
+    source = record.get("source")
+    data = record.get("data")
+    decoded = record.get("decoded")
+    if "timestamp" in record:
+        timestamp = record["timestamp"]
+    else:
+        timestamp = datetime.now(timezone.utc).timestamp()
+
+    if not pgn or not data:
+        return
+
+    # Track which PGNs we've seen
+    known_pgns.add(pgn)
+
+    # Check if decoding failed (decoded is None or error flag)
+    if decoded is None or (isinstance(decoded, dict) and decoded.get("error")):
+        discovery_record = {
+            "pgn": pgn,
+            "source": source,
+            "data": data,
+            "timestamp": timestamp,
+            "status": "error_or_unknown",
+        }
+        if verbose:
+            log.warning(f"Unknown/Error PGN: {pgn} from source {source}")
+        sink.write(discovery_record)
+    elif isinstance(decoded, dict):
+        # Track instance numbers to detect new ones
+        instance = decoded.get("instance")
+        if instance is not None and instance not in known_instances[pgn]:
+            known_instances[pgn].add(instance)
+            discovery_record = {
+                "pgn": pgn,
+                "source": source,
+                "instance": instance,
+                "data": data,
+                "decoded": decoded,
+                "timestamp": timestamp,
+                "status": "new_instance",
+            }
+            log.info(f"New instance: {pgn} instance={instance}")
+            sink.write(discovery_record)
+
+
+class RecordList(list):
+    """Sink stand-in that collects records in memory (batch workers)."""
+
+    def write(self, discovery_record):
+        self.append(discovery_record)
+
+
+class ChunkSummary(RecordList):
+    """RecordList for --batch --summary: unknowns are aggregated in the
+    worker, so only the per-key summaries cross the process boundary."""
+
+    def __init__(self):
+        super().__init__()
+        self.keys = {}  # (pgn, source) -> PgnSummary
+
+    def write(self, discovery_record):
+        if discovery_record["status"] == "error_or_unknown":
+            summarize_record(self.keys, discovery_record)
+        else:
+            self.append(discovery_record)
+
+
+def plan_batch(patterns, chunk_bytes):
+    """Expand globs into (path, start, end) tasks, oldest file first.
+
+    Plain files are cut at newline boundaries into ranges of about
+    chunk_bytes; .gz files can't be split and are one task each (end None).
+    """
+    paths = sorted(
+        {path for pattern in patterns for path in glob.glob(pattern)},
+        key=lambda path: (os.path.getmtime(path), path),
+    )
+    tasks = []
+    for path in paths:
+        if path.endswith(".gz"):
+            tasks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        start = 0
+        with open(path, "rb") as infile:
+            while start < size:
+                infile.seek(min(start + chunk_bytes, size))
+                infile.readline()  # Advance to the end of the current line
+                end = min(infile.tell(), size)
+                tasks.append((path, start, end))
+                start = end
+    return tasks
+
+
+def scan_chunk(task, summarize=False):
+    """Scan one byte range (or .gz file) with chunk-local known sets.
+
+    Returns (records, known_pgns, summaries). new_instance records are only
+    the first sighting within the chunk; merge_chunk() drops those already
+    seen in earlier chunks, which reproduces a sequential scan exactly. With
+    summarize, unknowns come back as {(pgn, source): PgnSummary} instead of
+    records (summaries is None otherwise).
+    """
+    path, start, end = task
+    records = ChunkSummary() if summarize else RecordList()
+    known_pgns = set()
+    known_instances = defaultdict(set)
+    if end is None:
+        with gzip.open(path, "rb") as infile:
+            for line in infile:
+                process_line(line, known_pgns, known_instances, records)
+    else:
+        with open(path, "rb") as infile:
+            infile.seek(start)
+            remaining = end - start
+            for line in infile:
+                process_line(line, known_pgns, known_instances, records)
+                remaining -= len(line)
+                if remaining <= 0:
+                    break
+    return records, known_pgns, records.keys if summarize else None
+
+
+def merge_chunk(records, chunk_pgns, summaries, known_pgns, known_instances, sink):
+    """Write a chunk's records in input order, dropping repeat instances."""
+    known_pgns.update(chunk_pgns)
+    if summaries:
+        sink.merge(summaries)
+    for discovery_record in records:
+        if discovery_record["status"] == "new_instance":
+            seen = known_instances[discovery_record["pgn"]]
+            if discovery_record["instance"] in seen:
+                continue
+            seen.add(discovery_record["instance"])
+        sink.write(discovery_record)
+
+
+def _quiet_worker():
+    """Per-record logging from many processes is just noise."""
+    log.setLevel(logging.ERROR)
+
+
+def run_batch(patterns, jobs, chunk_bytes, sink, summarize=False):
+    """Scan archived logs in parallel; output matches a sequential scan."""
+    tasks = plan_batch(patterns, chunk_bytes)
+    if not tasks:
+        log.error(f"No files match: {' '.join(patterns)}")
+        return None
+    log.info(
+        f"Scanning {len({task[0] for task in tasks})} files as {len(tasks)} "
+        f"chunks on {jobs} processes"
+    )
+
+    known_pgns = set()
+    known_instances = defaultdict(set)
+    start = time.perf_counter()
+    scan = functools.partial(scan_chunk, summarize=summarize)
+    if jobs == 1:
+        _quiet_worker()
+        results = map(scan, tasks)
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, initializer=_quiet_worker
+        )
+        # map() yields in submission order, so merging stays sequential
+        results = executor.map(scan, tasks)
+    try:
+        for records, chunk_pgns, summaries in results:
+            merge_chunk(
+                records, chunk_pgns, summaries, known_pgns, known_instances, sink
+            )
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    log.setLevel(logging.INFO)
+    log.info(f"Scanned in {time.perf_counter() - start:.1f}s; {sink.records:,} records")
+    return known_pgns, known_instances
+
+
+def _raise_interrupt(signum, frame):
+    """Treat SIGTERM (systemd stop) like Ctrl-C."""
+    raise KeyboardInterrupt
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -45,79 +921,193 @@ def main():
         default="pgn-discovery.jsonl",
         help="Path to write discovery log (output)",
     )
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Keep running and process new lines as the decoder writes them",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.25,
+        help="Seconds between checks when inotify is unavailable (--follow)",
+    )
+    parser.add_argument(
+        "--flush-bytes",
+        type=int,
+        default=FLUSH_BYTES,
+        help="Flush buffered output once this many bytes are pending",
+    )
+    parser.add_argument(
+        "--flush-interval",
+        type=float,
+        default=FLUSH_INTERVAL,
+        help="Flush buffered output once the oldest record is this old (seconds)",
+    )
+    parser.add_argument(
+        "--fsync-interval",
+        type=float,
+        default=0.0,
+        help="fsync the output at most this often in seconds (0 = never)",
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=int,
+        metavar="RECORDS",
+        help="Benchmark output throughput with this many records and exit",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file (default: OUTPUT.checkpoint; empty to disable)",
+    )
+    parser.add_argument(
+        "--rescan",
+        action="store_true",
+        help="Ignore the checkpoint and scan the whole log from scratch",
+    )
+    parser.add_argument(
+        "--batch",
+        action="append",
+        metavar="GLOB",
+        help="Scan archived logs (plain or .gz, repeatable) in parallel and exit",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --batch (1 = in-process)",
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=BATCH_CHUNK_BYTES // (1024 * 1024),
+        help="Approximate size of the ranges plain files are split into (--batch)",
+    )
+    parser.add_argument(
+        "--summary",
+        metavar="PATH",
+        help="Aggregate unknown/error frames by (pgn, source) into this JSON file "
+        "instead of writing one output line per frame",
+    )
+    parser.add_argument(
+        "--summary-interval",
+        type=float,
+        default=60.0,
+        help="Seconds between summary snapshots (--summary)",
+    )
     args = parser.parse_args()
 
+    if args.benchmark:
+        run_benchmark(args.benchmark)
+        return
+
+    if args.batch:
+        log.info(f"Writing to: {args.output}")
+        sink = OutputSink(
+            args.output, args.flush_bytes, args.flush_interval, args.fsync_interval
+        )
+        if args.summary:
+            sink = SummarySink(sink, args.summary, args.summary_interval)
+        try:
+            result = run_batch(
+                args.batch,
+                max(1, args.jobs),
+                args.chunk_mb * 1024 * 1024,
+                sink,
+                summarize=bool(args.summary),
+            )
+        finally:
+            sink.close()
+        if result is None:
+            sys.exit(1)
+        known_pgns, known_instances = result
+        log.info(
+            f"Discovered {len(known_pgns)} PGNs, {sum(len(v) for v in known_instances.values())} instances"
+        )
+        return
+
     log.info(f"Reading from: {args.log_file}")
     log.info(f"Writing to: {args.output}")
 
     known_pgns = set()
     known_instances = defaultdict(set)  # pgn -> set of seen instance numbers
+    position = None
+    summary_state = None
 
+    checkpoint_path = (
+        f"{args.output}.checkpoint" if args.checkpoint is None else args.checkpoint
+    )
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    if checkpoint is not None and not args.rescan:
+        position, known_pgns, known_instances, summary_state = checkpoint.load(
+            args.log_file
+        )
+
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    sink = OutputSink(
+        args.output, args.flush_bytes, args.flush_interval, args.fsync_interval
+    )
+    if args.summary:
+        log.info(f"Summarizing unknown PGNs to: {args.summary}")
+        sink = SummarySink(sink, args.summary, args.summary_interval, summary_state)
+
+    saved_identity = None
+    next_checkpoint = time.monotonic() + CHECKPOINT_INTERVAL
+
+    def save_checkpoint(final=False):
+        """Flush output first, then record how far we got (if anywhere).
+
+        The final save on exit also carries the summary's hash sets, which
+        are too large to rewrite every CHECKPOINT_INTERVAL.
+        """
+        nonlocal saved_identity
+        sink.flush()
+        identity = tailer.identity()
+        if checkpoint is None or identity is None:
+            return
+        if identity == saved_identity and not (final and args.summary):
+            return
+        checkpoint.save(
+            args.log_file,
+            identity,
+            known_pgns,
+            known_instances,
+            sink.state(full=final) if args.summary else None,
+        )
+        saved_identity = identity
+
+    def checkpoint_if_due():
+        nonlocal next_checkpoint
+        if time.monotonic() >= next_checkpoint:
+            save_checkpoint()
+            next_checkpoint = time.monotonic() + CHECKPOINT_INTERVAL
+
+    def on_idle():
+        """Caught up with the log: flush output and checkpoint if due."""
+        sink.flush_if_due()
+        checkpoint_if_due()
+
+    tailer = LogTailer(
+        args.log_file,
+        make_waiter(args.log_file, args.poll_interval) if args.follow else None,
+        on_idle=on_idle,
+        resume=position,
+    )
+    verbose = not args.summary  # The summary logs each key once instead
     try:
-        with open(args.log_file, "r") as infile:
-            for line in infile:
-                try:
-                    record = json.loads(line)
-                except json.JSONDecodeError:
-                    continue
-
-                pgn = record.get("pgn")
-                source = record.get("source")
-                data = record.get("data")
-                decoded = record.get("decoded")
-                timestamp = record.get("timestamp", datetime.now(timezone.utc).timestamp())
-
-                if not pgn or not data:
-                    continue
-
-                # Track which PGNs we've seen
-                known_pgns.add(pgn)
-
-                # Check if decoding failed (decoded is None or error flag)
-                if decoded is None or decoded.get("error"):
-                    discovery_record = {
-                        "pgn": pgn,
-                        "source": source,
-                        "data": data,
-                        "timestamp": timestamp,
-                        "status": "error_or_unknown",
-                    }
-                    log.warning(f"Unknown/Error PGN: {pgn} from source {source}")
-                    with open(args.output, "a") as outfile:
-                        outfile.write(json.dumps(discovery_record) + "\n")
-                else:
-                    # Track instance numbers to detect new ones
-                    if isinstance(decoded, dict):
-                        instance = decoded.get("instance")
-                        if instance is not None:
-                            if (
-                                instance
-                                not in known_instances[pgn]
-                            ):
-                                known_instances[pgn].add(instance)
-                                discovery_record = {
-                                    "pgn": pgn,
-                                    "source": source,
-                                    "instance": instance,
-                                    "data": data,
-                                    "decoded": decoded,
-                                    "timestamp": timestamp,
-                                    "status": "new_instance",
-                                }
-                                log.info(
-                                    f"New instance: {pgn} instance={instance}"
-                                )
-                                with open(args.output, "a") as outfile:
-                                    outfile.write(
-                                        json.dumps(discovery_record) + "\n"
-                                    )
+        for line in tailer.lines(follow=args.follow):
+            process_line(line, known_pgns, known_instances, sink, verbose)
+            checkpoint_if_due()
 
     except FileNotFoundError:
         log.error(f"Log file not found: {args.log_file}")
         sys.exit(1)
     except KeyboardInterrupt:
         log.info("Interrupted")
-        sys.exit(0)
+    finally:
+        save_checkpoint(final=True)
+        tailer.close()
+        sink.close()
 
     log.info(
         f"Discovered {len(known_pgns)} PGNs, {sum(len(v) for v in known_instances.values())} instances"
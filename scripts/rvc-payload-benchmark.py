@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+RV-C Payload Benchmark — JSON vs msgpack vs fixed struct
+
+Compares size and decode cost of the payload formats accepted by the
+rv_c_bridge integration (see ha-component-rv-c-bridge/codec.py) using a
+representative mix of battery, tank, zone and thermostat frames.
+
+Usage:
+  python3 rvc-payload-benchmark.py [--messages 200000]
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CODEC_PATH = os.path.join(SCRIPT_DIR, "../ha-component-rv-c-bridge/codec.py")
+
+SAMPLES = [
+    ("battery_status", {"soc_pct": 100, "voltage_v": 13.5, "current_a": 27.89, "timestamp": 1708003215.123}),
+    ("tank_status", {"level_pct": 62.5, "timestamp": 1708003215.2}),
+    ("zone_temperature", {"temp_f": 71.6, "timestamp": 1708003215.3}),
+    ("thermostat_setpoint", {"temp_f": 72.0, "timestamp": 1708003215.4}),
+    ("thermostat_status", {"mode": 2, "fan_mode": 1, "timestamp": 1708003215.5}),
+]
+
+
+def load_codec():
+    """Load codec.py standalone (it has no Home Assistant imports)."""
+    spec = importlib.util.spec_from_file_location("rvc_codec", CODEC_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench(label, frames, decode, count):
+    """Decode count frames round-robin and print size and throughput."""
+    size = sum(len(payload) for _, payload in frames) / len(frames)
+    n = len(frames)
+    start = time.perf_counter()
+    for i in range(count):
+        category, payload = frames[i % n]
+        decode(category, payload)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<16} {size:7.1f} B/msg  {elapsed / count * 1e6:7.2f} us/msg  "
+        f"{count / elapsed:12,.0f} msg/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rvcbridge payload formats")
+    parser.add_argument("--messages", type=int, default=200000, help="Frames to decode per format")
+    args = parser.parse_args()
+
+    codec = load_codec()
+    json_frames = [(c, json.dumps(d).encode()) for c, d in SAMPLES]
+
+    bench("json (stdlib)", json_frames, lambda c, p: json.loads(p), args.messages)
+    if codec.JSON_BACKEND != "json":
+        bench(f"json ({codec.JSON_BACKEND})", json_frames, lambda c, p: codec.json_loads(p), args.messages)
+
+    if codec.msgpack is not None:
+        frames = [(c, codec.msgpack.packb(d)) for c, d in SAMPLES]
+        bench("msgpack", frames, lambda c, p: codec.decode_payload(c, p, codec.FORMAT_MSGPACK), args.messages)
+    else:
+        print("msgpack          (not installed, skipped)")
+
+    frames = [(c, codec.encode_struct(c, d)) for c, d in SAMPLES]
+    bench("struct", frames, codec.decode_struct, args.messages)
+
+
+if __name__ == "__main__":
+    main()
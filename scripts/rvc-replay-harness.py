@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+RV-C Replay Harness — Offline load test for the rv_c_bridge integration
+
+Drives the real integration (async_setup_entry -> sensor/climate platforms ->
+ingress callbacks) without an MQTT broker or a configured Home Assistant. A bare
+HA core is created in a scratch config dir; MQTT subscribe/publish, config
+entries and entity platforms are replaced with in-process stand-ins. Home
+Assistant itself must be installed (pip install homeassistant).
+
+Traffic comes from either:
+  - a recorded capture, one JSON object per line:
+      {"ts": 1771696303.54, "topic": "rvcbridge/battery_status/1", "payload": {...}}
+  - or a synthetic mix of thermostat zones, batteries and tanks at a fixed rate
+
+Reports per-message handler latency percentiles, state writes per second and
+memory growth. With --reload-cycles the entry is unloaded and set up again N
+times (with traffic in between) before the run, and the harness fails if any
+message is dispatched more than once or subscriptions were left behind.
+
+Usage:
+  python3 rvc-replay-harness.py --capture ../tmp/auto-probe-test.jsonl --loops 500
+  python3 rvc-replay-harness.py --rate 2000 --duration 10 --zones 7 --batteries 2 --tanks 3
+  python3 rvc-replay-harness.py --messages 20000 --reload-cycles 20
+"""
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import itertools
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+INTEGRATION_DIR = os.path.join(SCRIPT_DIR, "../ha-component-rv-c-bridge")
+PACKAGE = "rv_c_bridge"
+
+
+def load_integration():
+    """Import the integration package from its source directory."""
+    # Importing mqtt outside a running HA trips a websocket_api import cycle
+    import homeassistant.components.persistent_notification  # noqa: F401
+
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE,
+        os.path.join(INTEGRATION_DIR, "__init__.py"),
+        submodule_search_locations=[INTEGRATION_DIR],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class FakeBroker:
+    """Stand-in for homeassistant.components.mqtt subscribe/publish."""
+
+    def __init__(self):
+        self.subscriptions = []  # (topic filter, callback, encoding)
+        self.published = []
+        self._routes = {}  # topic -> matching subscriptions (cleared on change)
+
+    async def async_subscribe(self, hass, topic, msg_callback, qos=0, encoding="utf-8"):
+        sub = (topic, msg_callback, encoding)
+        self.subscriptions.append(sub)
+        self._routes.clear()
+
+        def unsubscribe():
+            self.subscriptions.remove(sub)
+            self._routes.clear()
+
+        return unsubscribe
+
+    async def async_publish(self, hass, topic, payload, qos=0, retain=False, encoding="utf-8"):
+        self.published.append((topic, payload))
+
+    @staticmethod
+    def matches(topic_filter, topic):
+        """MQTT topic filter matching with + and #."""
+        filter_parts = topic_filter.split("/")
+        topic_parts = topic.split("/")
+        for i, part in enumerate(filter_parts):
+            if part == "#":
+                return True
+            if i >= len(topic_parts) or (part != "+" and part != topic_parts[i]):
+                return False
+        return len(filter_parts) == len(topic_parts)
+
+    def route(self, topic):
+        """Return the subscriptions matching topic (what the real client would call)."""
+        routes = self._routes.get(topic)
+        if routes is None:
+            routes = self._routes[topic] = [
+                sub for sub in self.subscriptions if self.matches(sub[0], topic)
+            ]
+        return routes
+
+    @staticmethod
+    def deliver(topic, payload, routes):
+        """Invoke each routed callback with a ReceiveMessage-like object."""
+        for _, msg_callback, encoding in routes:
+            data = payload if encoding is None else payload.decode(encoding)
+            msg_callback(types.SimpleNamespace(topic=topic, payload=data, qos=0, retain=False))
+
+
+class FakeEntry:
+    """Minimal ConfigEntry: id, options, unload callbacks and entry tasks."""
+
+    def __init__(self, options):
+        self.entry_id = "replay"
+        self.title = "RV-C Bridge (replay)"
+        self.data = {}
+        self.options = options
+        self._on_unload = []
+        self._tasks = set()
+
+    def async_on_unload(self, func):
+        self._on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+    def async_create_task(self, hass, target, name=None):
+        task = hass.async_create_task(target)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def async_unload(self):
+        """Run unload callbacks and wait for entry tasks, like ConfigEntry does."""
+        while self._on_unload:
+            result = self._on_unload.pop()()
+            if asyncio.iscoroutine(result):
+                await result
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=10)
+
+
+def build_hass(config_dir, platform_modules):
+    """Build a real HA core with stand-in config entries; platforms set up on forward."""
+    from homeassistant.core import CoreState, HomeAssistant
+
+    hass = HomeAssistant(config_dir)
+    hass.state = CoreState.running
+
+    def add_entities_factory():
+        def async_add_entities(entities, update_before_add=False):
+            for entity in entities:
+                entity.hass = hass
+                entity.platform = hass
+                entity.entity_id = f"replay.{entity.unique_id}"
+                entity.async_write_ha_state()
+        return async_add_entities
+
+    async def async_forward_entry_setups(entry, platforms):
+        for module in platform_modules:
+            await module.async_setup_entry(hass, entry, add_entities_factory())
+
+    async def async_unload_platforms(entry, platforms):
+        return True
+
+    hass.config_entries = types.SimpleNamespace(
+        async_forward_entry_setups=async_forward_entry_setups,
+        async_unload_platforms=async_unload_platforms,
+    )
+    return hass
+
+
+def load_capture(path):
+    """Load (topic, payload bytes) pairs from a JSONL capture."""
+    messages = []
+    with open(path, "r") as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            payload = record.get("payload")
+            if not isinstance(payload, (str, bytes)):
+                payload = json.dumps(payload)
+            if isinstance(payload, str):
+                payload = payload.encode()
+            messages.append((record["topic"], payload))
+    return messages
+
+
+def synthesize(zones, batteries, tanks):
+    """Yield an endless random-walk stream of (topic, payload bytes)."""
+    temps = [70.0 + z for z in range(zones)]
+    levels = [50.0] * tanks
+    volts = [13.2] * batteries
+    topics = (
+        [("zone", z) for z in range(zones)]
+        + [("thermostat", z) for z in range(zones)]
+        + [("battery", b) for b in range(batteries)]
+        + [("tank", t) for t in range(tanks)]
+    )
+    rng = random.Random(1)
+    while True:
+        kind, index = rng.choice(topics)
+        now = time.time()
+        if kind == "zone":
+            temps[index] += rng.uniform(-0.2, 0.2)
+            yield f"rvcbridge/zone_temperature/{index}", {"temp_f": round(temps[index], 1), "timestamp": now}
+        elif kind == "thermostat":
+            if rng.random() < 0.5:
+                yield f"rvcbridge/thermostat_status/{index}", {"mode": 2, "fan_mode": 1, "timestamp": now}
+            else:
+                yield f"rvcbridge/thermostat_setpoint/{index}", {"temp_f": 72, "timestamp": now}
+        elif kind == "battery":
+            volts[index] += rng.uniform(-0.03, 0.03)
+            yield f"rvcbridge/battery_status/{index}", {
+                "soc_pct": 90,
+                "voltage_v": round(volts[index], 2),
+                "current_a": round(rng.uniform(-20, 30), 2),
+                "timestamp": now,
+            }
+        else:
+            levels[index] = min(100.0, max(0.0, levels[index] + rng.uniform(-0.5, 0.5)))
+            yield f"rvcbridge/tank_status/{index}", {"level_pct": round(levels[index], 1), "timestamp": now}
+
+
+def rss_bytes():
+    """Current resident set size (Linux /proc, else peak RSS)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run(args):
+    integration = load_integration()
+    sensor = importlib.import_module(f"{PACKAGE}.sensor")
+    climate = importlib.import_module(f"{PACKAGE}.climate")
+    from homeassistant.components import mqtt
+    from homeassistant.helpers.entity import Entity
+
+    broker = FakeBroker()
+    mqtt.async_subscribe = broker.async_subscribe
+    mqtt.async_publish = broker.async_publish
+
+    writes = [0]
+
+    def count_write(self):
+        writes[0] += 1
+
+    Entity.async_write_ha_state = count_write
+
+    # Count ingress dispatches: more than one per message means a stale
+    # subscription from an earlier setup is still attached
+    from homeassistant.core import callback
+
+    ingress_module = importlib.import_module(f"{PACKAGE}.ingress")
+    handle_message = ingress_module.RVCIngress._async_handle_message
+    dispatches = [0]
+
+    @callback
+    def counting_handle_message(self, msg):
+        dispatches[0] += 1
+        handle_message(self, msg)
+
+    ingress_module.RVCIngress._async_handle_message = counting_handle_message
+
+    hass = build_hass(args.config_dir or tempfile.mkdtemp(prefix="rvc-replay-"), (sensor, climate))
+    entry = FakeEntry(json.loads(args.options) if args.options else {})
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    await integration.async_setup(hass, {})
+    await integration.async_setup_entry(hass, entry)
+    subscriptions = len(broker.subscriptions)
+
+    if args.reload_cycles:
+        burst = list(itertools.islice(synthesize(args.zones, args.batteries, args.tanks), 500))
+        for _ in range(args.reload_cycles):
+            for topic, payload in burst:
+                broker.deliver(topic, json.dumps(payload).encode(), broker.route(topic))
+            await asyncio.sleep(0.05)  # Let discovery batches and timers fire
+            if not await integration.async_unload_entry(hass, entry):
+                print("async_unload_entry returned False")
+                return 1
+            await entry.async_unload()
+            if broker.subscriptions or entry.entry_id in hass.data[integration.DOMAIN]:
+                print(f"unload leaked {len(broker.subscriptions)} subscriptions / entry data")
+                return 1
+            await integration.async_setup_entry(hass, entry)
+        if len(broker.subscriptions) != subscriptions:
+            print(f"subscriptions grew from {subscriptions} to {len(broker.subscriptions)}")
+            return 1
+        dispatches[0] = 0
+    mem_start = tracemalloc.get_traced_memory()[0] if args.tracemalloc else rss_bytes()
+
+    if args.capture:
+        capture = load_capture(args.capture)
+        stream = (capture[i % len(capture)] for i in range(len(capture) * args.loops))
+        total = len(capture) * args.loops
+    else:
+        stream = ((t, json.dumps(p).encode()) for t, p in synthesize(args.zones, args.batteries, args.tanks))
+        total = int(args.rate * args.duration) if args.rate else args.messages
+
+    latencies = []
+    deliveries = 0
+    interval = 1.0 / args.rate if args.rate else 0.0
+    start = time.perf_counter()
+    for sent, (topic, payload) in enumerate(stream):
+        if sent >= total:
+            break
+        routes = broker.route(topic)
+        t0 = time.perf_counter_ns()
+        broker.deliver(topic, payload, routes)
+        latencies.append(time.perf_counter_ns() - t0)
+        deliveries += len(routes)
+        if interval:
+            # Pace to the target rate; sleeping lets scheduler timers fire
+            lag = start + (sent + 1) * interval - time.perf_counter()
+            if lag > 0:
+                await asyncio.sleep(lag)
+        elif sent % 256 == 0:
+            await asyncio.sleep(0)
+
+    # Let pending batches/flushes run
+    await asyncio.sleep(args.settle)
+    elapsed = time.perf_counter() - start
+    if args.tracemalloc:
+        mem_end, mem_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory = f"{(mem_end - mem_start) / 1024:.1f} KiB traced (peak {mem_peak / 1024:.1f} KiB)"
+    else:
+        memory = f"{(rss_bytes() - mem_start) / 1024:.1f} KiB RSS"
+
+    latencies.sort()
+    entry_data = hass.data[integration.DOMAIN][entry.entry_id]
+    print(f"messages        {len(latencies):,} ({deliveries:,} callback deliveries)")
+    if args.reload_cycles:
+        per_message = dispatches[0] / len(latencies) if latencies else 0.0
+        print(f"reloads         {args.reload_cycles} ({per_message:.2f} ingress dispatches/message)")
+    print(f"wall time       {elapsed:.2f}s ({len(latencies) / elapsed:,.0f} msg/s)")
+    print(
+        "handler latency "
+        + "  ".join(
+            f"p{p}={percentile(latencies, p) / 1000:.1f}us" for p in (50, 90, 99, 99.9)
+        )
+        + f"  max={latencies[-1] / 1000 if latencies else 0:.1f}us"
+    )
+    print(f"state writes    {writes[0]:,} ({writes[0] / elapsed:,.1f}/s)")
+    print(f"entities        {len(entry_data['registry'])}")
+    print(f"memory growth   {memory}")
+
+    await entry.async_unload()
+    await hass.async_stop(force=True)
+    if args.reload_cycles and dispatches[0] > len(latencies):
+        print("FAIL: messages were dispatched more than once after reloads")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay/load test for the rv_c_bridge integration")
+    parser.add_argument("--capture", help="JSONL capture of rvcbridge traffic to replay")
+    parser.add_argument("--loops", type=int, default=1, help="Times to replay the capture")
+    parser.add_argument("--rate", type=float, default=0, help="Synthetic messages/sec (0 = as fast as possible)")
+    parser.add_argument("--duration", type=float, default=10, help="Synthetic run length in seconds (with --rate)")
+    parser.add_argument("--messages", type=int, default=100000, help="Synthetic message count when --rate is 0")
+    parser.add_argument("--zones", type=int, default=7, help="Thermostat zones in the synthetic mix")
+    parser.add_argument("--batteries", type=int, default=2, help="Batteries in the synthetic mix")
+    parser.add_argument("--tanks", type=int, default=3, help="Tanks in the synthetic mix")
+    parser.add_argument("--options", help="Config entry options as JSON")
+    parser.add_argument("--tracemalloc", action="store_true", help="Measure memory with tracemalloc (slows handlers)")
+    parser.add_argument("--config-dir", help="HA config dir (.storage snapshots persist across runs)")
+    parser.add_argument("--settle", type=float, default=1.0, help="Seconds to wait for pending flushes")
+    parser.add_argument("--reload-cycles", type=int, default=0, help="Unload/setup the entry this many times before the run")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()